@@ -7,8 +7,10 @@ for the AI Shader Validator test suite.
 
 import pytest
 import asyncio
+import sys
 import tempfile
 import os
+from types import MappingProxyType
 from typing import Dict, Any, Generator
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
@@ -18,62 +20,126 @@ from src.services.validation_service import get_validation_service
 from src.services.visualization_service import get_visualization_service
 from src.services.analysis_service import get_analysis_service
 
+# Immutable sample sources shared by the fixtures below
+_GLSL_SAMPLE = """
+    #version 330 core
+    
+    uniform float time;
+    uniform vec2 resolution;
+    
+    out vec4 fragColor;
+    
+    void main() {
+        vec2 uv = gl_FragCoord.xy / resolution.xy;
+        vec3 color = vec3(uv.x, uv.y, sin(time));
+        fragColor = vec4(color, 1.0);
+    }
+    """
+
+_MADMAPPER_SAMPLE = """
+    // MadMapper Shader
+    // @name Test Shader
+    // @description A test shader for MadMapper
+    // @author Test Author
+    // @version 1.0
+    
+    uniform float time;
+    uniform vec2 resolution;
+    
+    void main() {
+        vec2 uv = gl_FragCoord.xy / resolution.xy;
+        vec3 color = vec3(uv.x, uv.y, sin(time));
+        gl_FragColor = vec4(color, 1.0);
+    }
+    """
+
+_VALIDATION_REQUEST_SHADER = """
+        #version 330 core
+        uniform float time;
+        out vec4 fragColor;
+        void main() {
+            fragColor = vec4(1.0, 0.0, 0.0, 1.0);
+        }
+        """
+
+
+def _freeze(value: Any) -> Any:
+    """Deep-freeze sample data for session fixtures: dicts become read-only mappings, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Build a plain, mutable copy of frozen sample data."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+# Run the app's event loops (TestClient portal, async tests) on uvloop when available
+if sys.platform != "win32":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def anyio_backend():
+    """Run anyio-based tests on the asyncio backend (uvloop policy applies)."""
+    return "asyncio"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI application."""
-    return TestClient(app)
+    """Create a test client for the FastAPI application (shared per session)."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
+def app_overrides():
+    """Snapshot app.dependency_overrides and restore them after the test."""
+    saved_overrides = dict(app.dependency_overrides)
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved_overrides)
+
+
+@pytest.fixture(scope="session")
 def validation_service():
     """Get the validation service instance."""
     return get_validation_service()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def visualization_service():
     """Get the visualization service instance."""
     return get_visualization_service()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def analysis_service():
     """Get the analysis service instance."""
     return get_analysis_service()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_glsl_shader():
     """Sample GLSL fragment shader for testing."""
-    return """
-    #version 330 core
-    
-    uniform float time;
-    uniform vec2 resolution;
-    
-    out vec4 fragColor;
-    
-    void main() {
-        vec2 uv = gl_FragCoord.xy / resolution.xy;
-        vec3 color = vec3(uv.x, uv.y, sin(time));
-        fragColor = vec4(color, 1.0);
-    }
-    """
+    return _GLSL_SAMPLE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_isf_shader():
-    """Sample ISF shader for testing."""
-    return {
+    """Sample ISF shader for testing (read-only; use mutable_isf_shader to modify it)."""
+    return _freeze({
         "ISFVersion": "2",
         "DESCRIPTION": "Test ISF Shader",
         "INPUTS": [
@@ -100,112 +166,142 @@ def sample_isf_shader():
             "    return vec4(color, 1.0);",
             "}"
         ]
-    }
+    })
 
 
 @pytest.fixture
+def mutable_isf_shader(sample_isf_shader):
+    """Private copy of the sample ISF shader for tests that modify it."""
+    return _thaw(sample_isf_shader)
+
+
+@pytest.fixture(scope="session")
 def sample_madmapper_shader():
     """Sample MadMapper shader for testing."""
-    return """
-    // MadMapper Shader
-    // @name Test Shader
-    // @description A test shader for MadMapper
-    // @author Test Author
-    // @version 1.0
-    
-    uniform float time;
-    uniform vec2 resolution;
-    
-    void main() {
-        vec2 uv = gl_FragCoord.xy / resolution.xy;
-        vec3 color = vec3(uv.x, uv.y, sin(time));
-        gl_FragColor = vec4(color, 1.0);
-    }
-    """
+    return _MADMAPPER_SAMPLE
 
 
-@pytest.fixture
-def mock_gl_context():
-    """Mock OpenGL context for testing."""
-    with patch('src.core.renderers.gl_context.OpenGLContext') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.__enter__ = Mock(return_value=mock_instance)
-        mock_instance.__exit__ = Mock(return_value=None)
-        yield mock_instance
+def _configured_mock(**return_values) -> Mock:
+    """Build a fresh Mock whose named methods return the given values."""
+    double = Mock()
+    for name, value in return_values.items():
+        getattr(double, name).return_value = value
+    return double
+
+
+def _patch_with_double(target: str, double: Mock) -> Generator[Mock, None, None]:
+    """Patch a factory/class to return the given double for one test."""
+    with patch(target, return_value=double):
+        yield double
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield temp_dir
+def mock_gl_context():
+    """Mock OpenGL context for testing."""
+    gl_context = Mock()
+    gl_context.__enter__ = Mock(return_value=gl_context)
+    gl_context.__exit__ = Mock(return_value=None)
+    yield from _patch_with_double('src.core.renderers.gl_context.OpenGLContext', gl_context)
 
 
 @pytest.fixture
 def mock_cache_manager():
     """Mock cache manager for testing."""
-    with patch('src.core.utils.cache_manager.get_cache_manager') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.get.return_value = None
-        mock_instance.set.return_value = True
-        mock_instance.exists.return_value = False
-        yield mock_instance
+    yield from _patch_with_double(
+        'src.core.utils.cache_manager.get_cache_manager',
+        _configured_mock(get=None, set=True, exists=False)
+    )
 
 
 @pytest.fixture
 def mock_performance_monitor():
     """Mock performance monitor for testing."""
-    with patch('src.core.utils.performance_monitor.get_performance_monitor') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.get_stats.return_value = {
+    yield from _patch_with_double(
+        'src.core.utils.performance_monitor.get_performance_monitor',
+        _configured_mock(get_stats={
             'cpu_usage': 50.0,
             'memory_usage': 60.0,
             'disk_usage': 70.0
-        }
-        yield mock_instance
+        })
+    )
 
 
 @pytest.fixture
 def mock_queue_service():
     """Mock queue service for testing."""
-    with patch('src.services.queue_service.get_queue_service') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.submit_job.return_value = "test-job-id"
-        mock_instance.get_job_status.return_value = {
+    yield from _patch_with_double(
+        'src.services.queue_service.get_queue_service',
+        _configured_mock(submit_job="test-job-id", get_job_status={
             'id': 'test-job-id',
             'status': 'completed',
             'result': {'test': 'result'}
-        }
-        yield mock_instance
+        })
+    )
+
+
+@pytest.fixture
+def mock_ml_analyzer():
+    """Mock ML analyzer for testing."""
+    yield from _patch_with_double(
+        'src.core.analyzers.ml_analyzer.MLAnalyzer',
+        _configured_mock(analyze_shader_ml={
+            'error_predictions': [],
+            'optimization_suggestions': [],
+            'quality_score': 0.85
+        })
+    )
 
 
 @pytest.fixture
+def mock_error_visualizer():
+    """Mock error visualizer for testing."""
+    yield from _patch_with_double(
+        'src.core.renderers.error_visualizer.ErrorVisualizer',
+        _configured_mock(create_error_report_image=b"fake_image_data")
+    )
+
+
+@pytest.fixture
+def mock_performance_charts():
+    """Mock performance charts for testing."""
+    yield from _patch_with_double(
+        'src.core.renderers.performance_charts.PerformanceCharts',
+        _configured_mock(create_performance_bar_chart=b"fake_chart_data")
+    )
+
+
+@pytest.fixture
+def mock_dependency_graphs():
+    """Mock dependency graphs for testing."""
+    yield from _patch_with_double(
+        'src.core.renderers.dependency_graphs.DependencyGraphs',
+        _configured_mock(create_function_dependency_graph=b"fake_graph_data")
+    )
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+@pytest.fixture(scope="session")
 def validation_request_data():
-    """Sample validation request data."""
-    return {
+    """Sample validation request data (read-only)."""
+    return _freeze({
         "shader_type": "GLSL",
-        "shader_source": """
-        #version 330 core
-        uniform float time;
-        out vec4 fragColor;
-        void main() {
-            fragColor = vec4(1.0, 0.0, 0.0, 1.0);
-        }
-        """,
+        "shader_source": _VALIDATION_REQUEST_SHADER,
         "parameters": {
             "time": 0.0
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def visualization_request_data():
-    """Sample visualization request data."""
-    return {
+    """Sample visualization request data (read-only)."""
+    return _freeze({
         "shader_type": "GLSL",
         "shader_source": """
         #version 330 core
@@ -222,7 +318,7 @@ def visualization_request_data():
         "parameters": {
             "time": 0.0
         }
-    }
+    })
 
 
 @pytest.fixture
@@ -236,12 +332,12 @@ def mock_websocket():
     return mock_ws
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_validation_errors():
     """Sample validation errors for testing."""
     from src.core.models.errors import ValidationError, ErrorSeverity
     
-    return [
+    return (
         ValidationError(
             message="Undefined variable 'undefined_var'",
             severity=ErrorSeverity.ERROR,
@@ -253,70 +349,26 @@ def sample_validation_errors():
             severity=ErrorSeverity.WARNING,
             line_number=8,
             column_number=15
-        )
-    ]
+        ),
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_performance_data():
     """Sample performance data for testing."""
-    return {
+    return MappingProxyType({
         "cpu_usage": 45.2,
         "memory_usage": 67.8,
         "texture_lookups": 15,
         "arithmetic_operations": 120,
         "conditional_statements": 8
-    }
-
-
-@pytest.fixture
-def mock_ml_analyzer():
-    """Mock ML analyzer for testing."""
-    with patch('src.core.analyzers.ml_analyzer.MLAnalyzer') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.analyze_shader_ml.return_value = {
-            'error_predictions': [],
-            'optimization_suggestions': [],
-            'quality_score': 0.85
-        }
-        yield mock_instance
-
-
-@pytest.fixture
-def mock_error_visualizer():
-    """Mock error visualizer for testing."""
-    with patch('src.core.renderers.error_visualizer.ErrorVisualizer') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.create_error_report_image.return_value = b"fake_image_data"
-        yield mock_instance
-
-
-@pytest.fixture
-def mock_performance_charts():
-    """Mock performance charts for testing."""
-    with patch('src.core.renderers.performance_charts.PerformanceCharts') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.create_performance_bar_chart.return_value = b"fake_chart_data"
-        yield mock_instance
+    })
 
 
-@pytest.fixture
-def mock_dependency_graphs():
-    """Mock dependency graphs for testing."""
-    with patch('src.core.renderers.dependency_graphs.DependencyGraphs') as mock:
-        mock_instance = Mock()
-        mock.return_value = mock_instance
-        mock_instance.create_function_dependency_graph.return_value = b"fake_graph_data"
-        yield mock_instance
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_settings():
     """Test settings configuration."""
-    return {
+    return MappingProxyType({
         "app_name": "AI Shader Validator Test",
         "app_version": "1.0.0-test",
         "debug": True,
@@ -330,7 +382,7 @@ def test_settings():
         "default_image_width": 512,
         "default_image_height": 512,
         "max_image_size": 2048
-    }
+    })
 
 
 @pytest.fixture(autouse=True)
@@ -347,7 +399,11 @@ def setup_test_environment():
 
 
 def pytest_configure(config):
-    """Configure pytest with custom markers."""
+    """Configure pytest with custom markers and preload the application."""
+    # Eager-load the app's import graph once per process (including xdist
+    # workers) so its cost stays out of the first test that touches it
+    import src.api.main  # noqa: F401
+    
     config.addinivalue_line(
         "markers", "unit: mark test as a unit test"
     )
@@ -368,17 +424,23 @@ def pytest_configure(config):
     )
 
 
+# Marker applied to tests whose node id contains the given substring (first match wins)
+_MARK_RULES = (
+    ("test_api", pytest.mark.api),
+    ("test_integration", pytest.mark.integration),
+    ("test_security", pytest.mark.security),
+    ("test_performance", pytest.mark.performance),
+)
+
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on test names."""
     for item in items:
         # Add markers based on test file names
-        if "test_api" in item.nodeid:
-            item.add_marker(pytest.mark.api)
-        elif "test_integration" in item.nodeid:
-            item.add_marker(pytest.mark.integration)
-        elif "test_security" in item.nodeid:
-            item.add_marker(pytest.mark.security)
-        elif "test_performance" in item.nodeid:
-            item.add_marker(pytest.mark.performance)
+        nodeid = item.nodeid
+        for substring, marker in _MARK_RULES:
+            if substring in nodeid:
+                item.add_marker(marker)
+                break
         else:
-            item.add_marker(pytest.mark.unit) 
\ No newline at end of file
+            item.add_marker(pytest.mark.unit)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Pre-bake the OpenAPI spec
+
+Imports the application, generates its OpenAPI schema once and writes it next
+to src/api/main.py, where the app loads it at import instead of building it
+on the first /openapi.json or /docs request.
+
+Usage: python scripts/build_openapi.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import orjson
+
+from src.api.main import app, OPENAPI_SPEC_PATH
+
+
+def main() -> None:
+    # Drop any previously baked spec so the schema is regenerated from the routes
+    app.openapi_schema = None
+    OPENAPI_SPEC_PATH.write_bytes(orjson.dumps(app.openapi()))
+    print(f"Wrote {OPENAPI_SPEC_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,20 +5,25 @@ AI Shader Validation Tool - Main FastAPI Application
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+import asyncio
+import orjson
 import uvicorn
 import logging
 from datetime import datetime
 from typing import Dict, Any
 import time
+from pathlib import Path
 
 # Import configuration and logging
 from src.config.settings import settings
 from src.config.logging import setup_logging, get_logger
+from src.core.utils.time_utils import utc_now, utc_now_iso
 
 # Import middleware
-from src.api.middleware.logging import LoggingMiddleware
-from src.api.middleware.rate_limiting import RateLimitMiddleware
+from src.api.middleware.dispatch import HTTPOnlyMiddleware
+from src.api.middleware.observability import ObservabilityMiddleware
+from src.api.middleware.security import SecurityMiddleware
 
 # Import exception handlers
 from src.api.models.errors import (
@@ -38,6 +43,10 @@ from src.api.models.errors import (
 # Import response models
 from src.api.models.responses import HealthResponse, ErrorResponse
 
+# Import services
+from src.services.validation_service import shutdown_process_pool, warm_process_pool
+from src.services.visualization_service import shutdown_render_executor
+
 # Import routes
 from src.api.routes import health as health_routes
 from src.api.routes import validation as validation_routes
@@ -55,7 +64,8 @@ app = FastAPI(
     description="Advanced shader validation and analysis tool supporting GLSL, ISF, and MadMapper formats",
     version=settings.app_version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -73,9 +83,20 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure appropriately for production
 )
 
-# Add custom middleware
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(RateLimitMiddleware)
+def _http_middleware_classes() -> list:
+    """HTTP middleware chain, outermost first"""
+    classes = [ObservabilityMiddleware]
+    if settings.enable_security_middleware:
+        # Pattern tables compile when the chain is built (get_compiled_patterns), not at import
+        classes.append(SecurityMiddleware)
+    return classes
+
+# Add custom middleware (HTTP only; rate limiting and logging in one layer,
+# then request scanning when enabled)
+app.add_middleware(
+    HTTPOnlyMiddleware,
+    middleware_classes=_http_middleware_classes()
+)
 
 # Add exception handlers
 app.add_exception_handler(ValidationException, validation_exception_handler)
@@ -98,11 +119,16 @@ async def startup_event():
     logger.info(f"Version: {settings.app_version}")
     logger.info(f"Debug mode: {settings.debug}")
     logger.info(f"Startup time: {datetime.utcnow()}")
+    
+    # Spawn the batch validation workers before the first parallel batch needs them
+    await asyncio.to_thread(warm_process_pool)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
     logger.info(f"{settings.app_name} shutting down...")
+    shutdown_process_pool()
+    shutdown_render_executor()
     logger.info(f"Shutdown time: {datetime.utcnow()}")
 
 @app.get("/")
@@ -112,7 +138,7 @@ async def root():
         "message": settings.app_name,
         "version": settings.app_version,
         "status": "running",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utc_now_iso(),
         "documentation": "/docs"
     }
 
@@ -129,7 +155,7 @@ async def health_check():
         health_status = HealthResponse(
             status="healthy",
             version=settings.app_version,
-            timestamp=datetime.utcnow(),
+            timestamp=utc_now(),
             services={
                 "api": "healthy",
                 "database": "healthy",  # Will be updated in Step 3
@@ -142,47 +168,53 @@ async def health_check():
         logger.error(f"Health check failed: {e}")
         raise HTTPException(status_code=503, detail="Service unhealthy")
 
+# Application information and configuration are derived from static settings,
+# so serialize them once instead of per request
+_app_info_body = orjson.dumps({
+    "name": settings.app_name,
+    "version": settings.app_version,
+    "description": "Advanced shader validation and analysis tool",
+    "supported_formats": ["GLSL", "ISF", "MadMapper"],
+    "features": [
+        "Syntax validation",
+        "Semantic analysis",
+        "Logic flow analysis",
+        "Performance analysis",
+        "Visual analysis",
+        "AI-powered optimization"
+    ],
+    "api_version": "v1",
+    "documentation": "/docs",
+    "configuration": {
+        "debug": settings.debug,
+        "log_level": settings.log_level,
+        "rate_limit": settings.rate_limit_per_minute
+    }
+})
+
 @app.get("/api/v1/info")
 async def get_info():
     """Get application information"""
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "description": "Advanced shader validation and analysis tool",
-        "supported_formats": ["GLSL", "ISF", "MadMapper"],
-        "features": [
-            "Syntax validation",
-            "Semantic analysis",
-            "Logic flow analysis",
-            "Performance analysis",
-            "Visual analysis",
-            "AI-powered optimization"
-        ],
-        "api_version": "v1",
-        "documentation": "/docs",
-        "configuration": {
-            "debug": settings.debug,
-            "log_level": settings.log_level,
-            "rate_limit": settings.rate_limit_per_minute
-        }
-    }
+    return Response(content=_app_info_body, media_type="application/json")
+
+_app_config_body = orjson.dumps({
+    "app_name": settings.app_name,
+    "app_version": settings.app_version,
+    "debug": settings.debug,
+    "log_level": settings.log_level,
+    "rate_limit_per_minute": settings.rate_limit_per_minute,
+    "max_shader_size": settings.max_shader_size,
+    "max_batch_size": settings.max_batch_size,
+    "validation_timeout": settings.validation_timeout,
+    "default_image_width": settings.default_image_width,
+    "default_image_height": settings.default_image_height,
+    "max_image_size": settings.max_image_size
+})
 
 @app.get("/api/v1/config")
 async def get_config():
     """Get application configuration (non-sensitive)"""
-    return {
-        "app_name": settings.app_name,
-        "app_version": settings.app_version,
-        "debug": settings.debug,
-        "log_level": settings.log_level,
-        "rate_limit_per_minute": settings.rate_limit_per_minute,
-        "max_shader_size": settings.max_shader_size,
-        "max_batch_size": settings.max_batch_size,
-        "validation_timeout": settings.validation_timeout,
-        "default_image_width": settings.default_image_width,
-        "default_image_height": settings.default_image_height,
-        "max_image_size": settings.max_image_size
-    }
+    return Response(content=_app_config_body, media_type="application/json")
 
 # Include health routes
 app.include_router(health_routes.router, prefix="/api/v1")
@@ -193,6 +225,21 @@ app.include_router(validation_routes.router, prefix="/api/v1")
 # Include visualization routes
 app.include_router(visualization_routes.router, prefix="/api/v1")
 
+# OpenAPI spec baked at build time by scripts/build_openapi.py
+OPENAPI_SPEC_PATH = Path(__file__).with_name("openapi.json")
+
+def _load_prebuilt_openapi() -> None:
+    """Serve the pre-baked OpenAPI spec instead of generating it on first request"""
+    try:
+        spec = orjson.loads(OPENAPI_SPEC_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return
+    # A spec baked for another release is stale; let FastAPI regenerate it
+    if spec.get("info", {}).get("version") == app.version:
+        app.openapi_schema = spec
+
+_load_prebuilt_openapi()
+
 if __name__ == "__main__":
     uvicorn.run(
         "src.api.main:app",
@@ -5,17 +5,30 @@ Authentication middleware
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
-from typing import Optional
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 from src.config.settings import settings
+from src.api.middleware.paths import PUBLIC_PATHS
 
 security = HTTPBearer()
 
 class AuthMiddleware:
     """Authentication middleware for API endpoints"""
     
+    # Endpoints that never require authentication
+    _PUBLIC_PATHS = PUBLIC_PATHS
+    
     def __init__(self):
         self.secret_key = settings.secret_key
         self.algorithm = settings.algorithm
+        self._algorithms = [self.algorithm]
+        
+        # Verified token payloads keyed by token digest: digest -> (expires_at, payload)
+        self._token_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.token_cache_size = 4096
+        self.token_cache_ttl = 60  # seconds
     
     async def __call__(self, request: Request, call_next):
         """Process the request and add authentication if needed"""
@@ -43,7 +56,7 @@ class AuthMiddleware:
                 )
             
             # Verify token
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._verify_token(token)
             request.state.user = payload
             
         except jwt.ExpiredSignatureError:
@@ -51,7 +64,7 @@ class AuthMiddleware:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired",
             )
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token",
@@ -64,17 +77,41 @@ class AuthMiddleware:
         
         return await call_next(request)
     
+    def _verify_token(self, token: str) -> Dict[str, Any]:
+        """Verify a token, reusing the payload of a recently verified identical token"""
+        # Key by digest so raw tokens are not kept in memory
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.time()
+        
+        cached = self._token_cache.get(cache_key)
+        if cached is not None:
+            expires_at, payload = cached
+            if expires_at > now:
+                self._token_cache.move_to_end(cache_key)
+                return payload
+            del self._token_cache[cache_key]
+        
+        # Reject tokens signed with an unexpected algorithm before paying for the signature check
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") != self.algorithm:
+            raise jwt.InvalidAlgorithmError("Unexpected token algorithm")
+        
+        payload = jwt.decode(token, self.secret_key, algorithms=self._algorithms)
+        
+        # Never cache past the token's own expiry
+        expires_at = now + self.token_cache_ttl
+        if "exp" in payload:
+            expires_at = min(expires_at, float(payload["exp"]))
+        
+        if len(self._token_cache) >= self.token_cache_size:
+            self._token_cache.popitem(last=False)
+        self._token_cache[cache_key] = (expires_at, payload)
+        
+        return payload
+    
     def _is_public_endpoint(self, path: str) -> bool:
         """Check if the endpoint is public (no authentication required)"""
-        public_paths = [
-            "/",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/api/v1/health",
-            "/api/v1/info"
-        ]
-        return path in public_paths
+        return path in self._PUBLIC_PATHS
 
 def get_current_user(request: Request):
     """Get the current authenticated user from request state"""
@@ -0,0 +1,25 @@
+"""
+HTTP-only middleware dispatch
+"""
+
+from typing import Sequence
+
+class HTTPOnlyMiddleware:
+    """Route HTTP scopes through a middleware chain and pass all other scopes straight to the app"""
+    
+    def __init__(self, app, middleware_classes: Sequence[type]):
+        self.app = app
+        
+        # Build the HTTP chain; the first class listed is the outermost
+        http_app = app
+        for middleware_class in reversed(middleware_classes):
+            http_app = middleware_class(http_app)
+        self.http_app = http_app
+    
+    async def __call__(self, scope, receive, send):
+        """ASGI callable"""
+        if scope["type"] == "http":
+            await self.http_app(scope, receive, send)
+        else:
+            # Lifespan and websocket scopes never touch the HTTP middlewares
+            await self.app(scope, receive, send)
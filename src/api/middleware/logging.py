@@ -2,14 +2,14 @@
 Request logging middleware
 """
 
-from fastapi import Request, Response
 import time
 import logging
-from typing import Callable
 from src.config.logging import get_logger
 
 logger = get_logger("api.middleware")
 
+RESPONSE_TIME_HEADER = b"x-response-time"
+
 class LoggingMiddleware:
     """Request logging middleware for API endpoints"""
     
@@ -17,21 +17,18 @@ class LoggingMiddleware:
         self.app = app
     
     async def __call__(self, scope, receive, send):
-        """ASGI callable"""
-        if scope["type"] != "http":
-            await self.app(scope, receive, send)
-            return
-        
-        request = Request(scope, receive)
+        """ASGI callable (HTTP scopes only, see HTTPOnlyMiddleware)"""
+        # Read request details straight from the ASGI scope
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        host = client[0] if client else "unknown"
         
-        # Start time
-        start_time = time.time()
+        # Start time (monotonic, immune to wall-clock adjustments)
+        start_time = time.monotonic()
         
         # Log request
-        logger.info(
-            f"Request started: {request.method} {request.url.path} "
-            f"from {request.client.host if request.client else 'unknown'}"
-        )
+        logger.info("Request started: %s %s from %s", method, path, host)
         
         # Process request
         try:
@@ -39,29 +36,26 @@ class LoggingMiddleware:
             async def custom_send(message):
                 if message["type"] == "http.response.start":
                     # Add response time header
-                    message["headers"].append((b"x-response-time", f"{time.time() - start_time:.3f}s".encode()))
+                    elapsed = format(time.monotonic() - start_time, ".3f").encode("ascii") + b"s"
+                    message["headers"].append((RESPONSE_TIME_HEADER, elapsed))
                 await send(message)
             
             await self.app(scope, receive, custom_send)
             
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log successful response
-            logger.info(
-                f"Request completed: {request.method} {request.url.path} "
-                f"in {duration:.3f}s"
-            )
+            # Log successful response (skip the timing work when INFO is filtered)
+            if logger.isEnabledFor(logging.INFO):
+                duration = time.monotonic() - start_time
+                logger.info("Request completed: %s %s in %.3fs", method, path, duration)
             
         except Exception as e:
             # Calculate duration
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             
             # Log error
             logger.error(
-                f"Request failed: {request.method} {request.url.path} "
+                f"Request failed: {method} {path} "
                 f"-> {type(e).__name__}: {str(e)} in {duration:.3f}s"
             )
             
             # Re-raise the exception
-            raise 
\ No newline at end of file
+            raise
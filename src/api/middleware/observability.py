@@ -0,0 +1,56 @@
+"""
+Combined rate limiting and request logging middleware
+"""
+
+import time
+import logging
+from src.api.middleware.logging import logger, RESPONSE_TIME_HEADER
+from src.api.middleware.rate_limiting import RateLimitMiddleware
+
+class ObservabilityMiddleware(RateLimitMiddleware):
+    """Rate limiting and request logging in a single ASGI layer"""
+    
+    async def __call__(self, scope, receive, send):
+        """ASGI callable (HTTP scopes only, see HTTPOnlyMiddleware)"""
+        path = scope["path"]
+        
+        # Rate limit everything except health probes and docs
+        if path not in self._SKIP_PATHS:
+            if not self._is_allowed(self._get_client_id(scope)):
+                await self._send_rate_limited(send)
+                return
+        
+        method = scope["method"]
+        client = scope.get("client")
+        host = client[0] if client else "unknown"
+        
+        # Start time (monotonic, immune to wall-clock adjustments)
+        start_time = time.monotonic()
+        status_code = None
+        
+        logger.info("Request started: %s %s from %s", method, path, host)
+        
+        try:
+            # Add the response time header and capture the status in one wrapper
+            async def observed_send(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    elapsed = format(time.monotonic() - start_time, ".3f").encode("ascii") + b"s"
+                    message["headers"].append((RESPONSE_TIME_HEADER, elapsed))
+                await send(message)
+            
+            await self.app(scope, receive, observed_send)
+            
+            # Log successful response (skip the timing work when INFO is filtered)
+            if logger.isEnabledFor(logging.INFO):
+                duration = time.monotonic() - start_time
+                logger.info("Request completed: %s %s -> %s in %.3fs", method, path, status_code, duration)
+            
+        except Exception as e:
+            duration = time.monotonic() - start_time
+            logger.error(
+                f"Request failed: {method} {path} "
+                f"-> {type(e).__name__}: {str(e)} in {duration:.3f}s"
+            )
+            raise
@@ -0,0 +1,14 @@
+"""
+Shared endpoint path sets used by middleware
+"""
+
+# Endpoints that never require authentication and are exempt from rate limiting
+# (health probes, docs, and static app information)
+PUBLIC_PATHS = frozenset({
+    "/",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/api/v1/health",
+    "/api/v1/info"
+})
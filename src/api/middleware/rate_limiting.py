@@ -2,86 +2,136 @@
 Rate limiting middleware
 """
 
-from fastapi import Request, HTTPException, status
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
+import orjson
+from collections import OrderedDict, deque
+from typing import Deque, Tuple
 from src.config.settings import settings
+from src.api.middleware.paths import PUBLIC_PATHS
+
+FORWARDED_FOR_HEADER = b"x-forwarded-for"
 
 class RateLimitMiddleware:
     """Rate limiting middleware for API endpoints"""
     
+    # Health probes and docs bypass rate-limit bookkeeping entirely
+    _SKIP_PATHS = PUBLIC_PATHS
+    
+    _RATE_LIMIT_HEADERS = (
+        (b"content-type", b"application/json"),
+        (b"retry-after", b"60")
+    )
+    
     def __init__(self, app):
         self.app = app
-        self.requests: Dict[str, list] = defaultdict(list)
         self.rate_limit = settings.rate_limit_per_minute
+        # Per-client request windows, kept in least-recently-used order
+        self.requests: "OrderedDict[str, Deque[float]]" = OrderedDict()
         self.window_size = 60  # 1 minute window
+        self._rate_limit_body = {
+            "error": "Rate Limit Exceeded",
+            "detail": f"Rate limit exceeded. Maximum {self.rate_limit} requests per minute.",
+            "code": "RATE_LIMIT_EXCEEDED"
+        }
+        self.max_tracked_clients = 100000
+        
+        # Periodic sweep of idle clients to bound memory
+        self.gc_interval = 60  # seconds
+        self.gc_request_interval = 1000
+        self._requests_since_gc = 0
+        self._last_gc = time.monotonic()
     
     async def __call__(self, scope, receive, send):
-        """ASGI callable"""
-        if scope["type"] != "http":
+        """ASGI callable (HTTP scopes only, see HTTPOnlyMiddleware)"""
+        if scope["path"] in self._SKIP_PATHS:
             await self.app(scope, receive, send)
             return
         
-        request = Request(scope, receive)
-        
         # Get client identifier (IP address for now)
-        client_id = self._get_client_id(request)
+        client_id = self._get_client_id(scope)
         
-        # Check rate limit
+        # Check rate limit (records the request when allowed)
         if not self._is_allowed(client_id):
-            # Create rate limit response
-            response_data = {
-                "error": "Rate Limit Exceeded",
-                "detail": f"Rate limit exceeded. Maximum {self.rate_limit} requests per minute.",
-                "code": "RATE_LIMIT_EXCEEDED",
-                "timestamp": time.time()
-            }
-            
-            await send({
-                "type": "http.response.start",
-                "status": 429,
-                "headers": [
-                    (b"content-type", b"application/json"),
-                    (b"retry-after", b"60")
-                ]
-            })
-            
-            import json
-            await send({
-                "type": "http.response.body",
-                "body": json.dumps(response_data).encode()
-            })
+            await self._send_rate_limited(send)
             return
         
-        # Add request to tracking
-        self._add_request(client_id)
-        
         await self.app(scope, receive, send)
     
-    def _get_client_id(self, request: Request) -> str:
+    async def _send_rate_limited(self, send):
+        """Send the 429 rate limit response"""
+        response_data = {**self._rate_limit_body, "timestamp": time.time()}
+        
+        # Outer middlewares may append to the header list, so send a fresh one
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": list(self._RATE_LIMIT_HEADERS)
+        })
+        
+        await send({
+            "type": "http.response.body",
+            "body": orjson.dumps(response_data)
+        })
+    
+    def _get_client_id(self, scope) -> str:
         """Get client identifier (IP address)"""
-        # Get real IP if behind proxy
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+        # Get real IP if behind proxy (ASGI header names are lowercased bytes)
+        for name, value in scope["headers"]:
+            if name == FORWARDED_FOR_HEADER:
+                comma = value.find(b",")
+                forwarded_for = (value[:comma] if comma != -1 else value).strip()
+                if forwarded_for:
+                    return forwarded_for.decode("latin-1")
+                break
         
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
     def _is_allowed(self, client_id: str) -> bool:
-        """Check if client is within rate limit"""
-        now = time.time()
+        """Check if client is within rate limit and record the request if so"""
+        now = time.monotonic()
         window_start = now - self.window_size
         
-        # Clean old requests
-        self.requests[client_id] = [
-            req_time for req_time in self.requests[client_id]
-            if req_time > window_start
-        ]
+        self._maybe_collect(now)
+        
+        # Evict expired requests from the head of the window
+        request_times = self._get_window(client_id)
+        while request_times and request_times[0] <= window_start:
+            request_times.popleft()
         
         # Check if within limit
-        return len(self.requests[client_id]) < self.rate_limit
+        if len(request_times) >= self.rate_limit:
+            return False
+        
+        request_times.append(now)
+        return True
     
-    def _add_request(self, client_id: str):
-        """Add a request to the tracking"""
-        self.requests[client_id].append(time.time()) 
\ No newline at end of file
+    def _get_window(self, client_id: str) -> Deque[float]:
+        """Get the request window for a client, evicting the least recently seen client when full"""
+        request_times = self.requests.get(client_id)
+        if request_times is None:
+            if len(self.requests) >= self.max_tracked_clients:
+                self.requests.popitem(last=False)
+            request_times = deque(maxlen=self.rate_limit)
+            self.requests[client_id] = request_times
+        else:
+            self.requests.move_to_end(client_id)
+        return request_times
+    
+    def _maybe_collect(self, now: float):
+        """Drop clients with no requests left in the window every N requests or seconds"""
+        self._requests_since_gc += 1
+        if (self._requests_since_gc < self.gc_request_interval
+                and now - self._last_gc < self.gc_interval):
+            return
+        
+        self._requests_since_gc = 0
+        self._last_gc = now
+        window_start = now - self.window_size
+        
+        expired_clients = [
+            client_id for client_id, request_times in self.requests.items()
+            if not request_times or request_times[-1] <= window_start
+        ]
+        for client_id in expired_clients:
+            del self.requests[client_id]
@@ -0,0 +1,19 @@
+"""
+Models shared across the API model modules
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, Union
+from datetime import datetime
+from src.core.utils.time_utils import utc_now
+
+__all__ = ["ErrorResponse"]
+
+
+class ErrorResponse(BaseModel):
+    """Standard error response model"""
+    
+    error: str = Field(..., description="Error message")
+    detail: Optional[Union[str, Dict[str, Any]]] = Field(None, description="Detailed error information")
+    code: Optional[str] = Field(None, description="Error code")
+    timestamp: datetime = Field(default_factory=utc_now, description="Error timestamp")
@@ -3,11 +3,9 @@ Error models and exception handlers
 """
 
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
-from typing import Union
-from src.api.models.responses import ErrorResponse
-from datetime import datetime
-from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, Optional, Union
+from src.core.utils.time_utils import utc_now_iso
 
 class ValidationException(HTTPException):
     """Custom exception for validation errors"""
@@ -39,75 +37,43 @@ class RateLimitException(HTTPException):
     def __init__(self, detail: str = "Rate limit exceeded"):
         super().__init__(status_code=429, detail=detail)
 
+def _error_response(status_code: int, error: str, detail: Any, code: str,
+                    headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """Build an ErrorResponse-shaped body and serialize it with orjson"""
+    return ORJSONResponse(
+        status_code=status_code,
+        content={
+            "error": error,
+            "detail": detail,
+            "code": code,
+            "timestamp": utc_now_iso()
+        },
+        headers=headers
+    )
+
 async def validation_exception_handler(request: Request, exc: ValidationException):
     """Handler for validation exceptions"""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=jsonable_encoder(ErrorResponse(
-            error="Validation Error",
-            detail=exc.detail,
-            code="VALIDATION_ERROR",
-            timestamp=datetime.utcnow()
-        ))
-    )
+    return _error_response(exc.status_code, "Validation Error", exc.detail, "VALIDATION_ERROR")
 
 async def shader_parse_exception_handler(request: Request, exc: ShaderParseException):
     """Handler for shader parsing exceptions"""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=jsonable_encoder(ErrorResponse(
-            error="Shader Parse Error",
-            detail=exc.detail,
-            code="SHADER_PARSE_ERROR",
-            timestamp=datetime.utcnow()
-        ))
-    )
+    return _error_response(exc.status_code, "Shader Parse Error", exc.detail, "SHADER_PARSE_ERROR")
 
 async def processing_exception_handler(request: Request, exc: ProcessingException):
     """Handler for processing exceptions"""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=jsonable_encoder(ErrorResponse(
-            error="Processing Error",
-            detail=exc.detail,
-            code="PROCESSING_ERROR",
-            timestamp=datetime.utcnow()
-        ))
-    )
+    return _error_response(exc.status_code, "Processing Error", exc.detail, "PROCESSING_ERROR")
 
 async def resource_not_found_exception_handler(request: Request, exc: ResourceNotFoundException):
     """Handler for resource not found exceptions"""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=jsonable_encoder(ErrorResponse(
-            error="Resource Not Found",
-            detail=exc.detail,
-            code="RESOURCE_NOT_FOUND",
-            timestamp=datetime.utcnow()
-        ))
-    )
+    return _error_response(exc.status_code, "Resource Not Found", exc.detail, "RESOURCE_NOT_FOUND")
 
 async def rate_limit_exception_handler(request: Request, exc: RateLimitException):
     """Handler for rate limit exceptions"""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=jsonable_encoder(ErrorResponse(
-            error="Rate Limit Exceeded",
-            detail=exc.detail,
-            code="RATE_LIMIT_EXCEEDED",
-            timestamp=datetime.utcnow()
-        )),
+    return _error_response(
+        exc.status_code, "Rate Limit Exceeded", exc.detail, "RATE_LIMIT_EXCEEDED",
         headers={"Retry-After": "60"}
     )
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handler for general exceptions"""
-    return JSONResponse(
-        status_code=500,
-        content=jsonable_encoder(ErrorResponse(
-            error="Internal Server Error",
-            detail="An unexpected error occurred",
-            code="INTERNAL_ERROR",
-            timestamp=datetime.utcnow()
-        ))
-    ) 
\ No newline at end of file
+    return _error_response(500, "Internal Server Error", "An unexpected error occurred", "INTERNAL_ERROR")
@@ -7,6 +7,17 @@ from pydantic import BaseModel, Field, validator
 from enum import Enum
 
 
+# Allowed values checked by the field validators below
+_VALID_GLSL_VERSIONS = frozenset({
+    '110', '120', '130', '140', '150', '330', '400', '410', '420', '430', '440', '450', '460'
+})
+_VALID_SORT_ORDERS = frozenset({'asc', 'desc'})
+# History can only be sorted by index-backed columns
+_VALID_SORT_FIELDS = frozenset({'created_at'})
+_VALID_STATUSES = frozenset({'valid', 'invalid', 'warning', 'error'})
+_VALID_SEVERITIES = frozenset({'error', 'warning', 'info'})
+
+
 class ShaderFormat(str, Enum):
     """Supported shader formats."""
     GLSL = "glsl"
@@ -61,9 +72,8 @@ class ValidationRequest(BaseModel):
     @validator('target_version')
     def validate_glsl_version(cls, v, values):
         if values.get('format') == ShaderFormat.GLSL and v:
-            valid_versions = ['110', '120', '130', '140', '150', '330', '400', '410', '420', '430', '440', '450', '460']
-            if v not in valid_versions:
-                raise ValueError(f'Invalid GLSL version. Must be one of: {", ".join(valid_versions)}')
+            if v not in _VALID_GLSL_VERSIONS:
+                raise ValueError(f'Invalid GLSL version. Must be one of: {", ".join(sorted(_VALID_GLSL_VERSIONS))}')
         return v
     
     class Config:
@@ -139,15 +149,21 @@ class ValidationHistoryRequest(BaseModel):
     sort_by: str = Field("created_at", description="Field to sort by")
     sort_order: str = Field("desc", description="Sort order (asc/desc)")
     
+    @validator('sort_by')
+    def validate_sort_by(cls, v):
+        if v not in _VALID_SORT_FIELDS:
+            raise ValueError(f'Sort field must be one of: {", ".join(sorted(_VALID_SORT_FIELDS))}')
+        return v
+    
     @validator('sort_order')
     def validate_sort_order(cls, v):
-        if v not in ['asc', 'desc']:
+        if v not in _VALID_SORT_ORDERS:
             raise ValueError('Sort order must be either "asc" or "desc"')
         return v
     
     @validator('status')
     def validate_status(cls, v):
-        if v and v not in ['valid', 'invalid', 'warning', 'error']:
+        if v and v not in _VALID_STATUSES:
             raise ValueError('Status must be one of: valid, invalid, warning, error')
         return v
     
@@ -228,12 +244,12 @@ class ValidationFilter(BaseModel):
     
     @validator('severity')
     def validate_severity(cls, v):
-        if v and v not in ['error', 'warning', 'info']:
+        if v and v not in _VALID_SEVERITIES:
             raise ValueError('Severity must be one of: error, warning, info')
         return v
     
     @validator('status')
     def validate_status(cls, v):
-        if v and v not in ['valid', 'invalid', 'warning', 'error']:
+        if v and v not in _VALID_STATUSES:
             raise ValueError('Status must be one of: valid, invalid, warning, error')
         return v 
\ No newline at end of file
@@ -3,9 +3,31 @@ Response models for API endpoints
 """
 
 from pydantic import BaseModel, Field
+from pydantic_core import to_json
+from starlette.responses import Response
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
+from src.core.utils.time_utils import utc_now
+from src.api.models.common import ErrorResponse
+
+__all__ = [
+    "ValidationStatus", "ErrorSeverity", "ValidationError", "QualityMetric",
+    "PerformanceAnalysis", "PortabilityIssue", "ValidationResult", "ValidationResponse",
+    "BatchValidationResponse", "AnalysisResponse", "VisualizationResponse",
+    "ISFValidationResponse", "HealthResponse", "ErrorResponse", "BatchValidationResult",
+    "ValidationHistoryItem", "ValidationHistoryResponse", "ValidationStatusResponse",
+    "ErrorFrequency", "ValidationSummary", "PydanticJSONResponse"
+]
+
+# Envelope models no route serves yet live in responses_envelopes and are only
+# imported (and their schemas built) on first attribute access
+_LAZY_MODELS = frozenset({
+    "ValidationResponse", "BatchValidationResponse", "AnalysisResponse",
+    "VisualizationResponse", "ISFValidationResponse"
+})
+
+# Models are declared dependencies-first so each schema is built once, at class creation
 
 class ValidationStatus(str, Enum):
     """Validation status"""
@@ -30,8 +52,36 @@ class ValidationError(BaseModel):
     severity: ErrorSeverity = Field(..., description="Error severity")
     error_code: str = Field(..., description="Error code for categorization")
     context: Optional[str] = Field(None, description="Additional context")
-    suggestions: Optional[List[str]] = Field(None, description="Suggested fixes")
-    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+    suggestions: List[str] = Field(default_factory=list, description="Suggested fixes")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+
+class QualityMetric(BaseModel):
+    """Model for quality metrics."""
+    
+    name: str = Field(..., description="Metric name")
+    value: float = Field(..., description="Metric value")
+    unit: str = Field(..., description="Unit of measurement")
+    score: float = Field(..., description="Normalized score (0.0 to 1.0)")
+    description: str = Field(..., description="Metric description")
+    recommendations: List[str] = Field(default_factory=list, description="Recommendations")
+
+class PerformanceAnalysis(BaseModel):
+    """Model for performance analysis results."""
+    
+    complexity_score: float = Field(..., description="Overall complexity score")
+    instruction_count: int = Field(..., description="Estimated instruction count")
+    texture_samples: int = Field(..., description="Number of texture samples")
+    branch_count: int = Field(..., description="Number of conditional branches")
+    recommendations: List[str] = Field(default_factory=list, description="Performance recommendations")
+
+class PortabilityIssue(BaseModel):
+    """Model for portability issues."""
+    
+    issue_type: str = Field(..., description="Type of portability issue")
+    message: str = Field(..., description="Issue description")
+    affected_platforms: List[str] = Field(..., description="Platforms affected by this issue")
+    severity: ErrorSeverity = Field(..., description="Issue severity")
+    suggestions: List[str] = Field(default_factory=list, description="Suggested solutions")
 
 class ValidationResult(BaseModel):
     """Model for single validation result."""
@@ -50,8 +100,8 @@ class ValidationResult(BaseModel):
     
     # Quality and performance
     quality_metrics: Optional[Dict[str, Any]] = Field(None, description="Quality analysis results")
-    performance_analysis: Optional["PerformanceAnalysis"] = Field(None, description="Performance analysis")
-    portability_issues: List["PortabilityIssue"] = Field(default_factory=list, description="Portability issues")
+    performance_analysis: Optional[PerformanceAnalysis] = Field(None, description="Performance analysis")
+    portability_issues: List[PortabilityIssue] = Field(default_factory=list, description="Portability issues")
     
     # Metadata
     metadata: Optional[Dict[str, Any]] = Field(None, description="Shader metadata (e.g., ISF parameters, author, etc.)")
@@ -97,107 +147,15 @@ class ValidationResult(BaseModel):
             }
         }
 
-class ValidationResponse(BaseModel):
-    """Response model for shader validation"""
-    
-    shader_id: str = Field(..., description="Unique shader identifier")
-    format: str = Field(..., description="Shader format")
-    validation_level: str = Field(..., description="Validation level used")
-    result: ValidationResult = Field(..., description="Validation result")
-    processing_time: float = Field(..., description="Processing time in seconds")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Validation timestamp")
-
-class BatchValidationResponse(BaseModel):
-    """Response model for batch validation"""
-    
-    batch_id: str = Field(..., description="Batch identifier")
-    total_shaders: int = Field(..., description="Total number of shaders")
-    completed: int = Field(..., description="Number of completed validations")
-    failed: int = Field(..., description="Number of failed validations")
-    results: List[ValidationResponse] = Field(..., description="Validation results")
-    processing_time: float = Field(..., description="Total processing time")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Batch timestamp")
-
-class AnalysisResponse(BaseModel):
-    """Response model for shader analysis"""
-    
-    shader_id: str = Field(..., description="Shader identifier")
-    analysis_types: List[str] = Field(..., description="Types of analysis performed")
-    syntax_analysis: Optional[Dict[str, Any]] = Field(None, description="Syntax analysis results")
-    semantic_analysis: Optional[Dict[str, Any]] = Field(None, description="Semantic analysis results")
-    performance_analysis: Optional[Dict[str, Any]] = Field(None, description="Performance analysis results")
-    security_analysis: Optional[Dict[str, Any]] = Field(None, description="Security analysis results")
-    processing_time: float = Field(..., description="Processing time in seconds")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Analysis timestamp")
-
-class VisualizationResponse(BaseModel):
-    """Response model for shader visualization"""
-    
-    image_id: str = Field(..., description="Generated image identifier")
-    image_url: str = Field(..., description="URL to access the generated image")
-    width: int = Field(..., description="Image width")
-    height: int = Field(..., description="Image height")
-    format: str = Field(..., description="Image format")
-    file_size: int = Field(..., description="File size in bytes")
-    processing_time: float = Field(..., description="Processing time in seconds")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Generation timestamp")
-
-class ISFValidationResponse(BaseModel):
-    """Response model for ISF validation"""
-    
-    isf_id: str = Field(..., description="ISF identifier")
-    metadata: Dict[str, Any] = Field(..., description="ISF metadata")
-    glsl_validation: Optional[ValidationResult] = Field(None, description="GLSL validation result")
-    parameter_validation: Optional[ValidationResult] = Field(None, description="Parameter validation result")
-    overall_status: ValidationStatus = Field(..., description="Overall validation status")
-    processing_time: float = Field(..., description="Processing time in seconds")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Validation timestamp")
-
 class HealthResponse(BaseModel):
     """Response model for health check"""
     
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="Service version")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Health check timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Health check timestamp")
     services: Dict[str, str] = Field(..., description="Status of individual services")
     uptime: Optional[float] = Field(None, description="Service uptime in seconds")
 
-class ErrorResponse(BaseModel):
-    """Standard error response model"""
-    
-    error: str = Field(..., description="Error message")
-    detail: Optional[str] = Field(None, description="Detailed error information")
-    code: Optional[str] = Field(None, description="Error code")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
-
-class QualityMetric(BaseModel):
-    """Model for quality metrics."""
-    
-    name: str = Field(..., description="Metric name")
-    value: float = Field(..., description="Metric value")
-    unit: str = Field(..., description="Unit of measurement")
-    score: float = Field(..., description="Normalized score (0.0 to 1.0)")
-    description: str = Field(..., description="Metric description")
-    recommendations: Optional[List[str]] = Field(None, description="Recommendations")
-
-class PerformanceAnalysis(BaseModel):
-    """Model for performance analysis results."""
-    
-    complexity_score: float = Field(..., description="Overall complexity score")
-    instruction_count: int = Field(..., description="Estimated instruction count")
-    texture_samples: int = Field(..., description="Number of texture samples")
-    branch_count: int = Field(..., description="Number of conditional branches")
-    recommendations: List[str] = Field(default_factory=list, description="Performance recommendations")
-
-class PortabilityIssue(BaseModel):
-    """Model for portability issues."""
-    
-    issue_type: str = Field(..., description="Type of portability issue")
-    message: str = Field(..., description="Issue description")
-    affected_platforms: List[str] = Field(..., description="Platforms affected by this issue")
-    severity: ErrorSeverity = Field(..., description="Issue severity")
-    suggestions: Optional[List[str]] = Field(None, description="Suggested solutions")
-
 class BatchValidationResult(BaseModel):
     """Model for batch validation result."""
     
@@ -277,13 +235,15 @@ class ValidationHistoryResponse(BaseModel):
     """Model for validation history response."""
     
     items: List[ValidationHistoryItem] = Field(..., description="Validation history items")
-    total_count: int = Field(..., description="Total number of validations")
-    page_count: int = Field(..., description="Total number of pages")
-    current_page: int = Field(..., description="Current page number")
+    total_count: Optional[int] = Field(..., description="Total number of validations (null for cursor pages)")
+    page_count: Optional[int] = Field(..., description="Total number of pages (null for cursor pages)")
+    current_page: Optional[int] = Field(..., description="Current page number (null for cursor pages)")
     page_size: int = Field(..., description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there may be one")
+    approximate: bool = Field(False, description="Whether total_count is a statistics estimate rather than an exact count")
     
     # Filtering information
-    applied_filters: Dict[str, Any] = Field(default_factory=dict, description="Applied filters")
+    applied_filters: Dict[str, str] = Field(default_factory=dict, description="Applied filters")
     
     class Config:
         schema_extra = {
@@ -293,6 +253,8 @@ class ValidationHistoryResponse(BaseModel):
                 "page_count": 3,
                 "current_page": 1,
                 "page_size": 50,
+                "next_cursor": "WyIyMDI0LTAxLTE1VDEwOjMwOjAwIiwidmFsX2FiYzEyMyJd",
+                "approximate": False,
                 "applied_filters": {
                     "format": "glsl",
                     "status": "valid"
@@ -327,6 +289,12 @@ class ValidationStatusResponse(BaseModel):
             }
         }
 
+class ErrorFrequency(BaseModel):
+    """Model for an error code and how often it occurred."""
+    
+    error_code: str = Field(..., description="Error code")
+    count: int = Field(..., description="Number of occurrences")
+
 class ValidationSummary(BaseModel):
     """Model for validation summary statistics."""
     
@@ -338,7 +306,7 @@ class ValidationSummary(BaseModel):
     # Error statistics
     total_errors: int = Field(..., description="Total number of errors")
     total_warnings: int = Field(..., description="Total number of warnings")
-    most_common_errors: List[Dict[str, Any]] = Field(..., description="Most common error types")
+    most_common_errors: List[ErrorFrequency] = Field(..., description="Most common error types")
     
     # Quality statistics
     average_quality_score: float = Field(..., description="Average quality score")
@@ -381,4 +349,20 @@ class ValidationSummary(BaseModel):
                     "madmapper": 50
                 }
             }
-        } 
\ No newline at end of file
+        }
+
+class PydanticJSONResponse(Response):
+    """JSON response that serializes pydantic models straight to bytes with pydantic-core"""
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def __getattr__(name: str):
+    """Load the envelope models on first access (PEP 562)."""
+    if name in _LAZY_MODELS:
+        from src.api.models import responses_envelopes
+        return getattr(responses_envelopes, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,73 @@
+"""
+Response envelope models not yet served by any route
+
+Imported lazily through src.api.models.responses so their schemas are only
+built by code that actually uses them.
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from src.core.utils.time_utils import utc_now
+from src.api.models.responses import ValidationResult, ValidationStatus
+
+__all__ = [
+    "ValidationResponse", "BatchValidationResponse", "AnalysisResponse",
+    "VisualizationResponse", "ISFValidationResponse"
+]
+
+class ValidationResponse(BaseModel):
+    """Response model for shader validation"""
+    
+    shader_id: str = Field(..., description="Unique shader identifier")
+    format: str = Field(..., description="Shader format")
+    validation_level: str = Field(..., description="Validation level used")
+    result: ValidationResult = Field(..., description="Validation result")
+    processing_time: float = Field(..., description="Processing time in seconds")
+    timestamp: datetime = Field(default_factory=utc_now, description="Validation timestamp")
+
+class BatchValidationResponse(BaseModel):
+    """Response model for batch validation"""
+    
+    batch_id: str = Field(..., description="Batch identifier")
+    total_shaders: int = Field(..., description="Total number of shaders")
+    completed: int = Field(..., description="Number of completed validations")
+    failed: int = Field(..., description="Number of failed validations")
+    results: List[ValidationResponse] = Field(..., description="Validation results")
+    processing_time: float = Field(..., description="Total processing time")
+    timestamp: datetime = Field(default_factory=utc_now, description="Batch timestamp")
+
+class AnalysisResponse(BaseModel):
+    """Response model for shader analysis"""
+    
+    shader_id: str = Field(..., description="Shader identifier")
+    analysis_types: List[str] = Field(..., description="Types of analysis performed")
+    syntax_analysis: Optional[Dict[str, Any]] = Field(None, description="Syntax analysis results")
+    semantic_analysis: Optional[Dict[str, Any]] = Field(None, description="Semantic analysis results")
+    performance_analysis: Optional[Dict[str, Any]] = Field(None, description="Performance analysis results")
+    security_analysis: Optional[Dict[str, Any]] = Field(None, description="Security analysis results")
+    processing_time: float = Field(..., description="Processing time in seconds")
+    timestamp: datetime = Field(default_factory=utc_now, description="Analysis timestamp")
+
+class VisualizationResponse(BaseModel):
+    """Response model for shader visualization"""
+    
+    image_id: str = Field(..., description="Generated image identifier")
+    image_url: str = Field(..., description="URL to access the generated image")
+    width: int = Field(..., description="Image width")
+    height: int = Field(..., description="Image height")
+    format: str = Field(..., description="Image format")
+    file_size: int = Field(..., description="File size in bytes")
+    processing_time: float = Field(..., description="Processing time in seconds")
+    timestamp: datetime = Field(default_factory=utc_now, description="Generation timestamp")
+
+class ISFValidationResponse(BaseModel):
+    """Response model for ISF validation"""
+    
+    isf_id: str = Field(..., description="ISF identifier")
+    metadata: Dict[str, Any] = Field(..., description="ISF metadata")
+    glsl_validation: Optional[ValidationResult] = Field(None, description="GLSL validation result")
+    parameter_validation: Optional[ValidationResult] = Field(None, description="Parameter validation result")
+    overall_status: ValidationStatus = Field(..., description="Overall validation status")
+    processing_time: float = Field(..., description="Processing time in seconds")
+    timestamp: datetime = Field(default_factory=utc_now, description="Validation timestamp")
@@ -7,6 +7,7 @@ This module contains Pydantic models for visualization API endpoints.
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 from enum import Enum
+from src.api.models.common import ErrorResponse
 
 
 class ImageFormat(str, Enum):
@@ -108,11 +109,3 @@ class BatchVisualizationResponse(BaseModel):
     failed: int = Field(default=0, description="Number of failed visualizations")
     results: List[VisualizationResponse] = Field(default_factory=list, description="Visualization results")
     status: str = Field(default="processing", description="Batch status")
-
-
-class ErrorResponse(BaseModel):
-    """Error response model."""
-    
-    error: str = Field(..., description="Error message")
-    details: Optional[Dict[str, Any]] = Field(default=None, description="Additional error details")
-    code: Optional[str] = Field(default=None, description="Error code") 
\ No newline at end of file
@@ -2,18 +2,57 @@
 Health check endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import threading
+import time
+from fastapi import APIRouter, HTTPException, Response
 from sqlalchemy import text
-from src.database.connection import get_db
+from src.database.connection import SessionLocal
 
 router = APIRouter()
 
+# Built once so SQLAlchemy reuses its compiled form on every ping
+_PING = text("SELECT 1")
+
+# Serialized once; healthy probes send these bytes as-is
+_DB_HEALTHY_BODY = b'{"database":"healthy"}'
+
+# A healthy ping is trusted for this many seconds before the pool is touched again
+DB_HEALTH_TTL = 0.5
+
+# Monotonic time of the last successful ping (None until the first one, or after a failure)
+_last_healthy = None
+_last_healthy_lock = threading.Lock()
+
+
+def reset_health_cache():
+    """Forget the last healthy ping, so the next probe goes to the database."""
+    global _last_healthy
+    with _last_healthy_lock:
+        _last_healthy = None
+
+
+def _ping_database():
+    """Ping the database on a session of its own (runs in a worker thread)."""
+    with SessionLocal() as db:
+        db.execute(_PING)
+
+
 @router.get("/health/db", tags=["health"])
-async def db_health_check(db: Session = Depends(get_db)):
+async def db_health_check():
+    global _last_healthy
+    now = time.monotonic()
+    with _last_healthy_lock:
+        last_healthy = _last_healthy
+    if last_healthy is not None and now - last_healthy < DB_HEALTH_TTL:
+        # No session is opened for a cached result
+        return Response(content=_DB_HEALTHY_BODY, media_type="application/json")
     try:
-        # Simple query to check DB connection
-        db.execute(text("SELECT 1"))
-        return {"database": "healthy"}
+        # Simple query to check DB connection, off the event loop
+        await asyncio.to_thread(_ping_database)
+        with _last_healthy_lock:
+            _last_healthy = now
+        return Response(content=_DB_HEALTHY_BODY, media_type="application/json")
     except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Database unhealthy: {e}") 
\ No newline at end of file
+        reset_health_cache()
+        raise HTTPException(status_code=503, detail=f"Database unhealthy: {e}")
@@ -3,8 +3,15 @@ Validation API routes
 """
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic_core import to_json
+from typing import List, Optional, Dict, Any, Tuple
+import asyncio
+import base64
+import binascii
+import orjson
+import threading
 import uuid
 import time
 from datetime import datetime, timedelta
@@ -14,17 +21,84 @@ from ..models.requests import (
     ValidationStatusRequest, ValidationParameters
 )
 from ..models.responses import (
-    ValidationResult, BatchValidationResult, ValidationHistoryResponse,
-    ValidationStatusResponse, ValidationSummary, ValidationError, ErrorResponse
+    ValidationResult, BatchValidationResult, ValidationHistoryItem, ValidationHistoryResponse,
+    ValidationStatusResponse, ValidationSummary, ValidationError, ErrorResponse,
+    PydanticJSONResponse, ValidationStatus, ErrorSeverity, PerformanceAnalysis, PortabilityIssue
 )
-from ...services.validation_service import validation_service
+from ...services.validation_service import validation_service, validate_batch_entry, get_process_pool
 from ...database.models import ValidationRecord, ValidationHistory
 from ...database.connection import get_db
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, asc
+from sqlalchemy import func, desc, asc, insert, case, tuple_, select, bindparam, text, or_, and_
 
 router = APIRouter(tags=["validation"])
 
+# History sort fields, limited to columns the history indexes can serve
+_HISTORY_SORT_COLUMNS = {"created_at": ValidationRecord.created_at}
+
+# The history filter's public meaning: "valid"/"invalid" select on is_valid, so
+# warnings count as valid and errors as invalid. Rows still without a status
+# (written before the column, not yet backfilled) fall back to is_valid itself
+_HISTORY_STATUS_FILTERS = {
+    "valid": or_(
+        ValidationRecord.status.in_((ValidationStatus.VALID.value, ValidationStatus.WARNING.value)),
+        and_(ValidationRecord.status.is_(None), ValidationRecord.is_valid.is_(True))
+    ),
+    "invalid": or_(
+        ValidationRecord.status.in_((ValidationStatus.INVALID.value, ValidationStatus.ERROR.value)),
+        and_(ValidationRecord.status.is_(None), ValidationRecord.is_valid.is_(False))
+    )
+}
+
+# Fixed statements built once at import, so every request hits the compiled cache
+_STATUS_QUERY = select(ValidationRecord).where(ValidationRecord.id == bindparam("vid"))
+
+# Counts, error totals and quality/performance statistics in one pass
+# (aggregates skip NULL quality scores and processing times on their own)
+_SUMMARY_STATS_QUERY = select(
+    func.count(ValidationRecord.id),
+    func.sum(case((ValidationRecord.is_valid == True, 1), else_=0)),
+    func.sum(case((ValidationRecord.is_valid == False, 1), else_=0)),
+    func.sum(case((ValidationRecord.warning_count > 0, 1), else_=0)),
+    func.sum(ValidationRecord.error_count),
+    func.sum(ValidationRecord.warning_count),
+    func.avg(ValidationRecord.quality_score),
+    func.avg(ValidationRecord.processing_time_ms),
+    func.min(ValidationRecord.processing_time_ms),
+    func.max(ValidationRecord.processing_time_ms)
+)
+
+_FORMAT_COUNTS_QUERY = select(
+    ValidationRecord.format,
+    func.count(ValidationRecord.id)
+).group_by(ValidationRecord.format)
+
+# Planner statistics for an O(1) row estimate of the whole table
+_PG_ROW_ESTIMATE = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE relname = :table"
+).bindparams(table=ValidationRecord.__tablename__)
+_SQLITE_HAS_STATS = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+_SQLITE_ROW_ESTIMATE = text(
+    "SELECT stat FROM sqlite_stat1 WHERE tbl = :table LIMIT 1"
+).bindparams(table=ValidationRecord.__tablename__)
+
+# A computed summary is served as-is for this many seconds
+SUMMARY_TTL = 30.0
+
+# (monotonic expiry time, summary) of the last computed summary, or None
+_summary_cache = None
+# Bumped on every reset, so a summary computed before a save is not stored after it
+_summary_generation = 0
+_summary_cache_lock = threading.Lock()
+
+
+def reset_summary_cache() -> None:
+    """Drop the cached summary so the next request recomputes it."""
+    global _summary_cache, _summary_generation
+    with _summary_cache_lock:
+        _summary_cache = None
+        _summary_generation += 1
+
 
 @router.post("/validate", response_model=ValidationResult)
 async def validate_shader(
@@ -43,21 +117,34 @@ async def validate_shader(
     - Performance analysis
     """
     start_time = time.time()
+    # One timestamp for the record and the response
+    now = datetime.utcnow()
     validation_id = f"val_{uuid.uuid4().hex[:12]}"
+    platform_values = [p.value for p in request.target_platforms]
+    # Columns shared by the success and error records
+    record_base = dict(
+        id=validation_id,
+        format=request.format.value,
+        target_version=request.target_version,
+        target_platforms=",".join(platform_values),
+        created_at=now
+    )
+    stored = False
     
     try:
         # Convert request to validation parameters
         parameters = {
             "target_version": request.target_version,
-            "target_platforms": [p.value for p in request.target_platforms],
+            "target_platforms": platform_values,
             "enable_quality_analysis": request.enable_quality_analysis,
             "enable_portability_analysis": request.enable_portability_analysis,
             "enable_performance_analysis": request.enable_performance_analysis,
             "custom_parameters": request.custom_parameters
         }
         
-        # Perform validation
-        validation_result = validation_service.validate(
+        # Perform validation in the threadpool so the event loop keeps serving other requests
+        validation_result = await run_in_threadpool(
+            validation_service.validate,
             request.code, 
             request.format.value, 
             parameters
@@ -67,30 +154,27 @@ async def validate_shader(
         
         # Create validation record
         validation_record = ValidationRecord(
-            id=validation_id,
-            format=request.format.value,
-            target_version=request.target_version,
-            target_platforms=",".join([p.value for p in request.target_platforms]),
+            **record_base,
             is_valid=validation_result["is_valid"],
+            status=_determine_status(validation_result).value,
             error_count=len(validation_result.get("errors", [])),
             warning_count=len(validation_result.get("warnings", [])),
             quality_score=validation_result.get("quality_metrics", {}).get("overall_score"),
-            processing_time_ms=processing_time,
-            created_at=datetime.utcnow()
+            processing_time_ms=processing_time
         )
         
-        # Store in database
-        db.add(validation_record)
-        db.commit()
+        # Store in database, off the event loop
+        await run_in_threadpool(_save_record, db, validation_record)
+        stored = True
         
-        # Convert to response model
-        response = ValidationResult(
+        # Convert to response model (fields are server-built, so skip re-validation)
+        response = ValidationResult.model_construct(
             validation_id=validation_id,
             is_valid=validation_result["is_valid"],
             status=_determine_status(validation_result),
             format=request.format.value,
             target_version=request.target_version,
-            target_platforms=[p.value for p in request.target_platforms],
+            target_platforms=platform_values,
             errors=_convert_errors(validation_result.get("errors", [])),
             warnings=_convert_errors(validation_result.get("warnings", [])),
             info=_convert_errors(validation_result.get("info", [])),
@@ -98,50 +182,50 @@ async def validate_shader(
             performance_analysis=_create_performance_analysis(validation_result),
             portability_issues=_create_portability_issues(validation_result.get("portability_issues", [])),
             metadata=validation_result.get("metadata"),
-            created_at=datetime.utcnow(),
+            created_at=now,
             processing_time_ms=processing_time,
             recommendations=validation_result.get("recommendations", [])
         )
         
-        return response
+        # Serialize directly; skips FastAPI re-validating the model against response_model
+        return PydanticJSONResponse(response)
         
     except Exception as e:
+        processing_time = (time.time() - start_time) * 1000
+        
         # Log error and return error response
-        error_response = ValidationResult(
+        error_response = ValidationResult.model_construct(
             validation_id=validation_id,
             is_valid=False,
-            status="error",
+            status=ValidationStatus.ERROR,
             format=request.format.value,
             target_version=request.target_version,
-            target_platforms=[p.value for p in request.target_platforms],
+            target_platforms=platform_values,
             errors=[ValidationError(
                 message=f"Validation failed: {str(e)}",
                 line=0,
                 column=0,
-                severity="error",
+                severity=ErrorSeverity.ERROR,
                 error_code="VALIDATION_ERROR"
             )],
-            created_at=datetime.utcnow(),
-            processing_time_ms=(time.time() - start_time) * 1000
-        )
-        
-        # Store error record
-        validation_record = ValidationRecord(
-            id=validation_id,
-            format=request.format.value,
-            target_version=request.target_version,
-            target_platforms=",".join([p.value for p in request.target_platforms]),
-            is_valid=False,
-            error_count=1,
-            warning_count=0,
-            processing_time_ms=(time.time() - start_time) * 1000,
-            created_at=datetime.utcnow()
+            created_at=now,
+            processing_time_ms=processing_time
         )
         
-        db.add(validation_record)
-        db.commit()
+        # Store an error record, unless the result was already stored before the failure
+        if not stored:
+            validation_record = ValidationRecord(
+                **record_base,
+                is_valid=False,
+                status=ValidationStatus.ERROR.value,
+                error_count=1,
+                warning_count=0,
+                processing_time_ms=processing_time
+            )
+            
+            await run_in_threadpool(_save_record, db, validation_record)
         
-        return error_response
+        return PydanticJSONResponse(error_response)
 
 
 @router.post("/validate/batch", response_model=BatchValidationResult)
@@ -158,17 +242,19 @@ async def validate_shaders_batch(
     """
     batch_id = request.batch_id or f"batch_{uuid.uuid4().hex[:12]}"
     start_time = time.time()
+    # Every row and result in the batch shares the batch's timestamp
+    now = datetime.utcnow()
+    per_shader_platforms = [[p.value for p in shader.target_platforms] for shader in request.shaders]
     
     try:
-        # Perform batch validation
-        batch_results = validation_service.validate_batch([
+        shader_entries = [
             {
                 "id": f"shader_{i}",
                 "code": shader.code,
                 "format": shader.format.value,
                 "parameters": {
                     "target_version": shader.target_version,
-                    "target_platforms": [p.value for p in shader.target_platforms],
+                    "target_platforms": per_shader_platforms[i],
                     "enable_quality_analysis": shader.enable_quality_analysis,
                     "enable_portability_analysis": shader.enable_portability_analysis,
                     "enable_performance_analysis": shader.enable_performance_analysis,
@@ -176,88 +262,119 @@ async def validate_shaders_batch(
                 }
             }
             for i, shader in enumerate(request.shaders)
-        ])
+        ]
         
-        # Convert to response models
+        # Perform batch validation off the event loop: across worker processes when
+        # parallel processing is requested, otherwise sequentially in the threadpool
+        if request.parallel_processing and len(shader_entries) > 1:
+            loop = asyncio.get_running_loop()
+            pool = get_process_pool()
+            batch_results = await asyncio.gather(*[
+                loop.run_in_executor(pool, validate_batch_entry, entry)
+                for entry in shader_entries
+            ])
+        else:
+            batch_results = await run_in_threadpool(validation_service.validate_batch, shader_entries)
+        
+        # Collect a row and a response model per result, accumulating batch statistics
+        # as running scalars. The models are built here, before anything is streamed,
+        # so a malformed result still fails the request with a clean 500
+        records = []
         validation_results = []
+        successful_validations = 0
         total_errors = 0
         total_warnings = 0
-        quality_scores = []
-        processing_times = []
+        quality_score_sum = 0.0
+        quality_score_count = 0
+        processing_time_sum = 0.0
         
         for i, result in enumerate(batch_results):
             validation_id = f"val_{uuid.uuid4().hex[:12]}"
+            errors = result.get("errors", [])
+            warnings = result.get("warnings", [])
+            quality_score = result.get("quality_metrics", {}).get("overall_score")
+            processing_time_ms = result.get("processing_time_ms", 0)
             
-            # Create validation record
-            validation_record = ValidationRecord(
-                id=validation_id,
-                format=request.shaders[i].format.value,
-                target_version=request.shaders[i].target_version,
-                target_platforms=",".join([p.value for p in request.shaders[i].target_platforms]),
-                is_valid=result["is_valid"],
-                error_count=len(result.get("errors", [])),
-                warning_count=len(result.get("warnings", [])),
-                quality_score=result.get("quality_metrics", {}).get("overall_score"),
-                processing_time_ms=result.get("processing_time_ms", 0),
-                created_at=datetime.utcnow()
-            )
+            # Column values for the validation record (id is generated here, so no PK fetch)
+            records.append({
+                "id": validation_id,
+                "format": request.shaders[i].format.value,
+                "target_version": request.shaders[i].target_version,
+                "target_platforms": ",".join(per_shader_platforms[i]),
+                "is_valid": result["is_valid"],
+                "status": _determine_status(result).value,
+                "error_count": len(errors),
+                "warning_count": len(warnings),
+                "quality_score": quality_score,
+                "processing_time_ms": processing_time_ms,
+                "created_at": now,
+                "updated_at": now
+            })
             
-            db.add(validation_record)
+            if result["is_valid"]:
+                successful_validations += 1
+            total_errors += len(errors)
+            total_warnings += len(warnings)
+            if quality_score:
+                quality_score_sum += quality_score
+                quality_score_count += 1
+            processing_time_sum += processing_time_ms
             
-            # Convert to response model
-            validation_result = ValidationResult(
+            # Convert to response model (fields are server-built, so skip re-validation)
+            validation_results.append(ValidationResult.model_construct(
                 validation_id=validation_id,
                 is_valid=result["is_valid"],
                 status=_determine_status(result),
                 format=request.shaders[i].format.value,
                 target_version=request.shaders[i].target_version,
-                target_platforms=[p.value for p in request.shaders[i].target_platforms],
-                errors=_convert_errors(result.get("errors", [])),
-                warnings=_convert_errors(result.get("warnings", [])),
+                target_platforms=per_shader_platforms[i],
+                errors=_convert_errors(errors),
+                warnings=_convert_errors(warnings),
                 info=_convert_errors(result.get("info", [])),
                 quality_metrics=result.get("quality_metrics"),
                 performance_analysis=_create_performance_analysis(result),
                 portability_issues=_create_portability_issues(result.get("portability_issues", [])),
                 metadata=result.get("metadata"),
-                created_at=datetime.utcnow(),
-                processing_time_ms=result.get("processing_time_ms", 0),
+                created_at=now,
+                processing_time_ms=processing_time_ms,
                 recommendations=result.get("recommendations", [])
-            )
-            
-            validation_results.append(validation_result)
-            total_errors += len(result.get("errors", []))
-            total_warnings += len(result.get("warnings", []))
-            
-            if result.get("quality_metrics", {}).get("overall_score"):
-                quality_scores.append(result["quality_metrics"]["overall_score"])
-            
-            processing_times.append(result.get("processing_time_ms", 0))
+            ))
         
-        db.commit()
+        await run_in_threadpool(_save_records, db, records)
         
         # Calculate batch statistics
-        successful_validations = sum(1 for r in batch_results if r["is_valid"])
         failed_validations = len(batch_results) - successful_validations
-        average_quality_score = sum(quality_scores) / len(quality_scores) if quality_scores else 0.0
-        average_processing_time = sum(processing_times) / len(processing_times) if processing_times else 0.0
-        
-        batch_result = BatchValidationResult(
-            batch_id=batch_id,
-            total_shaders=len(request.shaders),
-            processed_shaders=len(request.shaders),
-            successful_validations=successful_validations,
-            failed_validations=failed_validations,
-            results=validation_results,
-            total_errors=total_errors,
-            total_warnings=total_warnings,
-            average_quality_score=average_quality_score,
-            average_processing_time_ms=average_processing_time,
-            created_at=datetime.utcnow(),
-            completed_at=datetime.utcnow(),
-            parallel_processing=request.parallel_processing
-        )
-        
-        return batch_result
+        average_quality_score = quality_score_sum / quality_score_count if quality_score_count else 0.0
+        average_processing_time = processing_time_sum / len(batch_results) if batch_results else 0.0
+        
+        # Everything before the results array, without the closing brace
+        head = to_json({
+            "batch_id": batch_id,
+            "total_shaders": len(request.shaders),
+            "processed_shaders": len(request.shaders),
+            "successful_validations": successful_validations,
+            "failed_validations": failed_validations
+        })[:-1] + b',"results":['
+        
+        async def stream_batch_result():
+            """Yield the BatchValidationResult JSON one finished validation result at a time."""
+            yield head
+            for i, validation_result in enumerate(validation_results):
+                chunk = to_json(validation_result)
+                yield b"," + chunk if i else chunk
+            # Everything after the results array, without the opening brace
+            yield b"]," + to_json({
+                "total_errors": total_errors,
+                "total_warnings": total_warnings,
+                "average_quality_score": average_quality_score,
+                "average_processing_time_ms": average_processing_time,
+                "created_at": now,
+                "completed_at": datetime.utcnow(),
+                "parallel_processing": request.parallel_processing
+            })[1:]
+        
+        # Stream the results so only one serialized result is held at a time
+        return StreamingResponse(stream_batch_result(), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch validation failed: {str(e)}")
@@ -271,49 +388,48 @@ async def get_validation_history(
     start_date: Optional[str] = Query(None, description="Start date (ISO format)"),
     end_date: Optional[str] = Query(None, description="End date (ISO format)"),
     limit: int = Query(50, ge=1, le=1000, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    offset: int = Query(0, ge=0, description="Number of results to skip (deprecated: use cursor)"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
     sort_by: str = Query("created_at", description="Field to sort by"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve validation history with filtering and pagination.
+    
+    Pages are walked with the returned next_cursor, which seeks directly to the
+    next page. The offset parameter still works but is deprecated: the database
+    has to skip every earlier row. Cursor pages do not report totals.
     """
+    sort_column = _HISTORY_SORT_COLUMNS.get(sort_by)
+    if sort_column is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort_by must be one of: {', '.join(sorted(_HISTORY_SORT_COLUMNS))}"
+        )
+    
+    after = None
+    if cursor:
+        try:
+            after = _decode_history_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
     try:
-        # Build query
-        query = db.query(ValidationRecord)
-        
-        # Apply filters
-        if user_id:
-            query = query.filter(ValidationRecord.user_id == user_id)
-        if format:
-            query = query.filter(ValidationRecord.format == format)
-        if status:
-            if status == "valid":
-                query = query.filter(ValidationRecord.is_valid == True)
-            elif status == "invalid":
-                query = query.filter(ValidationRecord.is_valid == False)
-        if start_date:
-            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            query = query.filter(ValidationRecord.created_at >= start_dt)
-        if end_date:
-            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            query = query.filter(ValidationRecord.created_at <= end_dt)
-        
-        # Get total count
-        total_count = query.count()
+        records, total_count, estimate = await run_in_threadpool(
+            _fetch_history_page, db, user_id, format, status, start_date, end_date,
+            sort_column, sort_order, limit, offset, after
+        )
         
-        # Apply sorting
-        if sort_order == "desc":
-            query = query.order_by(desc(getattr(ValidationRecord, sort_by)))
+        # Calculate pagination info (cursor pages carry no totals)
+        if total_count is None:
+            page_count = current_page = None
         else:
-            query = query.order_by(asc(getattr(ValidationRecord, sort_by)))
-        
-        # Apply pagination
-        query = query.offset(offset).limit(limit)
+            current_page = (offset // limit) + 1
+            page_count = (total_count + limit - 1) // limit
         
-        # Execute query
-        records = query.all()
+        # A full page may have more after it
+        next_cursor = _encode_history_cursor(records[-1]) if len(records) == limit else None
         
         # Convert to response models
         items = []
@@ -332,11 +448,6 @@ async def get_validation_history(
             )
             items.append(item)
         
-        # Calculate pagination info
-        page_size = limit
-        current_page = (offset // page_size) + 1
-        page_count = (total_count + page_size - 1) // page_size
-        
         # Build applied filters
         applied_filters = {}
         if user_id:
@@ -355,11 +466,14 @@ async def get_validation_history(
             total_count=total_count,
             page_count=page_count,
             current_page=current_page,
-            page_size=page_size,
+            page_size=limit,
+            next_cursor=next_cursor,
+            approximate=estimate is not None,
             applied_filters=applied_filters
         )
         
-        return response
+        # Serialize directly; the model was validated once when built
+        return PydanticJSONResponse(response)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve validation history: {str(e)}")
@@ -375,18 +489,17 @@ async def get_validation_status(
     """
     try:
         # Query validation record
-        record = db.query(ValidationRecord).filter(ValidationRecord.id == validation_id).first()
+        record = await run_in_threadpool(_fetch_record, db, validation_id)
         
         if not record:
             raise HTTPException(status_code=404, detail="Validation not found")
         
         # Determine status
-        if record.is_valid is None:
-            status = "processing"
+        status = _determine_status_from_record(record)
+        if status is ValidationStatus.PROCESSING:
             progress = 0.5  # Placeholder
             estimated_completion = datetime.utcnow() + timedelta(seconds=30)
         else:
-            status = "valid" if record.is_valid else "invalid"
             progress = 1.0
             estimated_completion = None
         
@@ -399,7 +512,8 @@ async def get_validation_status(
             updated_at=record.updated_at or record.created_at
         )
         
-        return response
+        # Serialize directly; the model was validated once when built
+        return PydanticJSONResponse(response)
         
     except HTTPException:
         raise
@@ -413,44 +527,33 @@ async def get_validation_summary(
 ):
     """
     Get summary statistics for all validations.
+    
+    The summary is recomputed at most once every SUMMARY_TTL seconds.
     """
+    global _summary_cache
+    now = time.monotonic()
+    with _summary_cache_lock:
+        cached = _summary_cache
+        generation = _summary_generation
+    if cached is not None and now < cached[0]:
+        return PydanticJSONResponse(cached[1])
+    
     try:
-        # Get basic counts
-        total_validations = db.query(func.count(ValidationRecord.id)).scalar()
-        valid_shaders = db.query(func.count(ValidationRecord.id)).filter(ValidationRecord.is_valid == True).scalar()
-        invalid_shaders = db.query(func.count(ValidationRecord.id)).filter(ValidationRecord.is_valid == False).scalar()
-        warning_shaders = db.query(func.count(ValidationRecord.id)).filter(ValidationRecord.warning_count > 0).scalar()
-        
-        # Get error statistics
-        total_errors = db.query(func.sum(ValidationRecord.error_count)).scalar() or 0
-        total_warnings = db.query(func.sum(ValidationRecord.warning_count)).scalar() or 0
-        
-        # Get quality statistics
-        quality_stats = db.query(
-            func.avg(ValidationRecord.quality_score),
-            func.min(ValidationRecord.quality_score),
-            func.max(ValidationRecord.quality_score)
-        ).filter(ValidationRecord.quality_score.isnot(None)).first()
-        
-        average_quality_score = quality_stats[0] if quality_stats[0] else 0.0
-        
-        # Get performance statistics
-        perf_stats = db.query(
-            func.avg(ValidationRecord.processing_time_ms),
-            func.min(ValidationRecord.processing_time_ms),
-            func.max(ValidationRecord.processing_time_ms)
-        ).filter(ValidationRecord.processing_time_ms.isnot(None)).first()
-        
-        average_processing_time_ms = perf_stats[0] if perf_stats[0] else 0.0
-        fastest_validation_ms = perf_stats[1] if perf_stats[1] else 0.0
-        slowest_validation_ms = perf_stats[2] if perf_stats[2] else 0.0
+        stats, format_counts = await run_in_threadpool(_fetch_summary_rows, db)
+        
+        total_validations = stats[0]
+        valid_shaders = stats[1] or 0
+        invalid_shaders = stats[2] or 0
+        warning_shaders = stats[3] or 0
+        total_errors = stats[4] or 0
+        total_warnings = stats[5] or 0
+        average_quality_score = stats[6] or 0.0
+        average_processing_time_ms = stats[7] or 0.0
+        fastest_validation_ms = stats[8] or 0.0
+        slowest_validation_ms = stats[9] or 0.0
         
         # Get format distribution
         format_distribution = {}
-        format_counts = db.query(
-            ValidationRecord.format,
-            func.count(ValidationRecord.id)
-        ).group_by(ValidationRecord.format).all()
         
         for format_name, count in format_counts:
             format_distribution[format_name] = count
@@ -485,7 +588,12 @@ async def get_validation_summary(
             format_distribution=format_distribution
         )
         
-        return summary
+        with _summary_cache_lock:
+            if generation == _summary_generation:
+                _summary_cache = (now + SUMMARY_TTL, summary)
+        
+        # Serialize directly; the model was validated once when built
+        return PydanticJSONResponse(summary)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get validation summary: {str(e)}")
@@ -493,70 +601,206 @@ async def get_validation_summary(
 
 # Helper functions
 
-def _determine_status(validation_result: Dict[str, Any]) -> str:
+def _determine_status(validation_result: Dict[str, Any]) -> ValidationStatus:
     """Determine validation status from result."""
     if not validation_result["is_valid"]:
-        return "invalid"
+        return ValidationStatus.INVALID
     elif validation_result.get("warnings"):
-        return "warning"
+        return ValidationStatus.WARNING
     else:
-        return "valid"
+        return ValidationStatus.VALID
 
 
-def _determine_status_from_record(record: ValidationRecord) -> str:
+def _determine_status_from_record(record: ValidationRecord) -> ValidationStatus:
     """Determine validation status from database record."""
+    if record.status:
+        return ValidationStatus(record.status)
+    # Records written before the status column: derive it from the counts
     if record.is_valid is None:
-        return "processing"
+        return ValidationStatus.PROCESSING
     elif not record.is_valid:
-        return "invalid"
+        return ValidationStatus.INVALID
     elif record.warning_count > 0:
-        return "warning"
+        return ValidationStatus.WARNING
     else:
-        return "valid"
+        return ValidationStatus.VALID
+
+
+def _save_record(db: Session, record: ValidationRecord) -> None:
+    """Store one validation record, rolling back if the commit fails."""
+    db.add(record)
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    reset_summary_cache()
+
+
+def _save_records(db: Session, records: List[Dict[str, Any]]) -> None:
+    """Store validation rows in one executemany instead of a unit-of-work flush per row."""
+    try:
+        if records:
+            db.execute(insert(ValidationRecord), records)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    reset_summary_cache()
+
+
+def _fetch_history_page(
+    db: Session,
+    user_id: Optional[str],
+    format: Optional[str],
+    status: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    sort_column: Any,
+    sort_order: str,
+    limit: int,
+    offset: int,
+    after: Optional[Tuple[datetime, str]]
+) -> Tuple[List[ValidationRecord], Optional[int], Optional[int]]:
+    """
+    Fetch one page of validation history.
+    
+    Returns the records, the total (None for cursor pages) and the statistics
+    estimate the total came from (None when it was counted exactly).
+    """
+    # Build query
+    query = db.query(ValidationRecord)
+    
+    # Apply filters
+    if user_id:
+        query = query.filter(ValidationRecord.user_id == user_id)
+    if format:
+        query = query.filter(ValidationRecord.format == format)
+    if status in _HISTORY_STATUS_FILTERS:
+        query = query.filter(_HISTORY_STATUS_FILTERS[status])
+    if start_date:
+        start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        query = query.filter(ValidationRecord.created_at >= start_dt)
+    if end_date:
+        end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        query = query.filter(ValidationRecord.created_at <= end_dt)
+    
+    # Apply sorting (id breaks ties so the cursor position is unique)
+    direction = desc if sort_order == "desc" else asc
+    ordered = query.order_by(direction(sort_column), direction(ValidationRecord.id))
+    
+    if after is not None:
+        # Keyset page: seek past the cursor instead of skipping rows
+        position = tuple_(sort_column, ValidationRecord.id)
+        ordered = ordered.filter(position < after if sort_order == "desc" else position > after)
+        return ordered.limit(limit).all(), None, None
+    
+    # Unfiltered pages can take the table's row count from planner statistics
+    if not (user_id or format or status or start_date or end_date):
+        estimate = _estimate_record_count(db)
+        if estimate is not None:
+            return ordered.offset(offset).limit(limit).all(), estimate, estimate
+    
+    # Fetch the page with the filtered total as a window column (one round-trip)
+    rows = (
+        ordered.add_columns(func.count().over().label("total_count"))
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    if rows:
+        total_count = rows[0].total_count
+    elif offset:
+        # Paged past the end: no row carries the total, so count separately
+        total_count = query.count()
+    else:
+        total_count = 0
+    return [record for record, _ in rows], total_count, None
+
+
+def _fetch_record(db: Session, validation_id: str) -> Optional[ValidationRecord]:
+    """Look up a validation record by id."""
+    return db.execute(_STATUS_QUERY, {"vid": validation_id}).scalar_one_or_none()
+
+
+def _fetch_summary_rows(db: Session) -> Tuple[Any, List[Any]]:
+    """Fetch the summary aggregate row and the per-format counts."""
+    return db.execute(_SUMMARY_STATS_QUERY).one(), db.execute(_FORMAT_COUNTS_QUERY).all()
+
+
+def _estimate_record_count(db: Session) -> Optional[int]:
+    """Estimate the validation record count from planner statistics, if any are available."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        estimate = db.execute(_PG_ROW_ESTIMATE).scalar()
+        # -1 (or 0 on older servers) until the table has been vacuumed or analyzed
+        return estimate if estimate and estimate > 0 else None
+    if dialect == "sqlite" and db.execute(_SQLITE_HAS_STATS).scalar():
+        # The first number of a sqlite_stat1 row is the table's row count as of ANALYZE
+        stat = db.execute(_SQLITE_ROW_ESTIMATE).scalar()
+        return int(stat.split()[0]) if stat else None
+    return None
+
+
+def _encode_history_cursor(record: ValidationRecord) -> str:
+    """Encode a record's (created_at, id) sort position as an opaque cursor."""
+    position = orjson.dumps([record.created_at.isoformat(), record.id])
+    return base64.urlsafe_b64encode(position).decode("ascii")
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a history cursor, raising ValueError when it is malformed."""
+    try:
+        created_at, record_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(record_id)
+    except (TypeError, binascii.Error, orjson.JSONDecodeError, UnicodeEncodeError) as e:
+        raise ValueError("Invalid history cursor") from e
 
 
 def _convert_errors(errors: List[Dict[str, Any]]) -> List[ValidationError]:
     """Convert error dictionaries to ValidationError models."""
-    converted_errors = []
-    for error in errors:
-        converted_error = ValidationError(
+    # The service builds these dicts with the right types; only the severity
+    # string needs coercing, so construct without a full validation pass
+    construct = ValidationError.model_construct
+    return [
+        construct(
             message=error.get("message", ""),
             line=error.get("line", 0),
             column=error.get("column", 0),
-            severity=error.get("severity", "error"),
+            severity=ErrorSeverity(error.get("severity", ErrorSeverity.ERROR)),
             error_code=error.get("error_code", "UNKNOWN_ERROR"),
             context=error.get("context"),
-            suggestions=error.get("suggestions")
+            suggestions=error.get("suggestions") or []
         )
-        converted_errors.append(converted_error)
-    return converted_errors
+        for error in errors
+    ]
 
 
-def _create_performance_analysis(validation_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _create_performance_analysis(validation_result: Dict[str, Any]) -> Optional[PerformanceAnalysis]:
     """Create performance analysis from validation result."""
     if "performance_analysis" not in validation_result:
         return None
     
     perf = validation_result["performance_analysis"]
-    return {
-        "complexity_score": perf.get("complexity_score", 0.0),
-        "instruction_count": perf.get("instruction_count", 0),
-        "texture_samples": perf.get("texture_samples", 0),
-        "branch_count": perf.get("branch_count", 0),
-        "recommendations": perf.get("recommendations", [])
-    }
+    return PerformanceAnalysis(
+        complexity_score=perf.get("complexity_score", 0.0),
+        instruction_count=perf.get("instruction_count", 0),
+        texture_samples=perf.get("texture_samples", 0),
+        branch_count=perf.get("branch_count", 0),
+        recommendations=perf.get("recommendations", [])
+    )
 
 
-def _create_portability_issues(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _create_portability_issues(issues: List[Dict[str, Any]]) -> List[PortabilityIssue]:
     """Create portability issues from validation result."""
-    converted_issues = []
-    for issue in issues:
-        converted_issue = {
-            "issue_type": issue.get("issue_type", ""),
-            "message": issue.get("message", ""),
-            "affected_platforms": issue.get("affected_platforms", []),
-            "severity": issue.get("severity", "warning"),
-            "suggestions": issue.get("suggestions", [])
-        }
-        converted_issues.append(converted_issue)
-    return converted_issues 
\ No newline at end of file
+    construct = PortabilityIssue.model_construct
+    return [
+        construct(
+            issue_type=issue.get("issue_type", ""),
+            message=issue.get("message", ""),
+            affected_platforms=issue.get("affected_platforms", []),
+            severity=ErrorSeverity(issue.get("severity", ErrorSeverity.WARNING)),
+            suggestions=issue.get("suggestions") or []
+        )
+        for issue in issues
+    ]
@@ -4,13 +4,14 @@ Visualization API Routes
 This module contains FastAPI routes for shader visualization and image management.
 """
 
+import asyncio
 import logging
-import base64
 import json
-from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Depends, Query, Path
+from typing import Optional, List, Dict, Any, Callable
+from fastapi import APIRouter, HTTPException, Depends, Query, Path, Request, Form, File, UploadFile
 from fastapi.responses import Response, StreamingResponse
 import io
+import numpy as np
 
 from src.api.models.visualization_requests import (
     VisualizationRequest, VisualizationResponse, ImageInfo, ImageListResponse,
@@ -18,92 +19,134 @@ from src.api.models.visualization_requests import (
     BatchVisualizationRequest, BatchVisualizationResponse, ErrorResponse,
     ImageFormat, ShaderType
 )
-from src.services.visualization_service import get_visualization_service, VisualizationError
+from src.api.models.responses import PydanticJSONResponse
+from src.services.visualization_service import (
+    VisualizationService, VisualizationError, get_visualization_service, get_render_executor
+)
 from src.core.utils.image_utils import bytes_to_pil_image
+from PIL import Image
+
+try:
+    # SIMD base64 (libbase64); same signature and binascii.Error as the stdlib
+    from pybase64 import b64decode
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    from base64 import b64decode
+    PYBASE64_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["visualization"])
 
 
-@router.post("/", response_model=VisualizationResponse)
-async def visualize_shader(request: VisualizationRequest):
-    """
-    Visualize a shader by rendering it to an image.
-    
-    Args:
-        request: Visualization request with shader data and parameters
-        
-    Returns:
-        Visualization response with image ID and metadata
-    """
+def _accepts_webp(request: Request) -> bool:
+    """Whether the client's Accept header lists image/webp."""
+    return "image/webp" in request.headers.get("accept", "")
+
+
+def _render_request(service: VisualizationService, request: VisualizationRequest,
+                    input_textures: Optional[Dict[str, np.ndarray]] = None) -> str:
+    """Render one visualization request and return its image ID (call on the GL thread)."""
+    if request.shader_type == ShaderType.ISF:
+        image_id, _ = service.render_isf_shader(
+            json.loads(request.shader_source),
+            request.width,
+            request.height,
+            request.parameters,
+            request.format.value,
+            input_textures
+        )
+    else:
+        # GLSL, and MadMapper treated as a GLSL fragment shader
+        image_id, _ = service.render_glsl_shader(
+            request.shader_source,
+            request.width,
+            request.height,
+            request.parameters,
+            request.format.value,
+            input_textures
+        )
+    return image_id
+
+
+def _visualization_response(service: VisualizationService, image_id: str,
+                            request: VisualizationRequest) -> VisualizationResponse:
+    """Build the response for a rendered image (server-built, so skip re-validation)."""
+    metadata = service.get_image_metadata(image_id) or {}
+    return VisualizationResponse.model_construct(
+        image_id=image_id,
+        image_url=f"/api/v1/images/{image_id}",
+        width=request.width,
+        height=request.height,
+        format=request.format,
+        created_at=metadata.get('created_at', ''),
+        metadata=metadata
+    )
+
+
+def _texture_array(image: Image.Image) -> np.ndarray:
+    """View a decoded texture as the read-only RGBA array GL uploads, converting only when needed."""
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    # asarray wraps the pixel buffer instead of copying it again
+    return np.asarray(image)
+
+
+def _decode_texture(data: str) -> np.ndarray:
+    """Decode a base64 texture, bare or as a data URI, into a read-only RGBA numpy array."""
+    if data.startswith("data:"):
+        # The media type and ";base64" run up to the first comma
+        data = data[data.find(",") + 1:]
+    return _texture_array(bytes_to_pil_image(b64decode(data)))
+
+
+def _open_texture(file) -> np.ndarray:
+    """Read an uploaded texture straight from its stream into a read-only RGBA numpy array."""
+    return _texture_array(Image.open(file))
+
+
+async def _decode_textures(sources: Dict[str, Any],
+                           decode: Callable[[Any], np.ndarray]) -> Dict[str, np.ndarray]:
+    """Decode textures in worker threads, concurrently and off the event loop."""
+    decoded = await asyncio.gather(
+        *[asyncio.to_thread(decode, source) for source in sources.values()],
+        return_exceptions=True
+    )
+    for name, texture in zip(sources, decoded):
+        if isinstance(texture, Exception):
+            # Rendering without a texture the shader samples would silently be wrong
+            logger.warning(f"Failed to decode texture {name}: {texture}")
+            raise HTTPException(status_code=400, detail=f"Invalid texture '{name}'")
+    return dict(zip(sources, decoded))
+
+
+async def _visualize(request: VisualizationRequest, textures: Dict[str, Any],
+                     decode: Callable[[Any], np.ndarray]) -> PydanticJSONResponse:
+    """Decode the request's textures, render it and build the response."""
     try:
         service = get_visualization_service()
         
-        # Convert input textures from base64 if provided
         input_textures = None
-        if request.input_textures:
-            input_textures = {}
-            for name, data in request.input_textures.items():
-                try:
-                    # Decode base64 data
-                    texture_bytes = base64.b64decode(data)
-                    # Convert to PIL Image and then to numpy array
-                    texture_image = bytes_to_pil_image(texture_bytes)
-                    import numpy as np
-                    input_textures[name] = np.array(texture_image)
-                except Exception as e:
-                    logger.warning(f"Failed to decode texture {name}: {e}")
-                    continue
-        
-        # Render shader based on type
-        if request.shader_type == ShaderType.GLSL:
-            image_id, image_data = service.render_glsl_shader(
-                request.shader_source,
-                request.width,
-                request.height,
-                request.parameters,
-                request.format.value
-            )
-        elif request.shader_type == ShaderType.ISF:
-            # Parse ISF data
+        if textures:
+            input_textures = await _decode_textures(textures, decode)
+        
+        # Parse ISF data up front so malformed JSON is a client error
+        if request.shader_type == ShaderType.ISF:
             try:
-                isf_data = json.loads(request.shader_source)
+                json.loads(request.shader_source)
             except json.JSONDecodeError:
                 raise HTTPException(status_code=400, detail="Invalid ISF JSON data")
-            
-            image_id, image_data = service.render_isf_shader(
-                isf_data,
-                request.width,
-                request.height,
-                request.parameters,
-                request.format.value
-            )
-        elif request.shader_type == ShaderType.MADMAPPER:
-            # For MadMapper, treat as GLSL fragment shader
-            image_id, image_data = service.render_glsl_shader(
-                request.shader_source,
-                request.width,
-                request.height,
-                request.parameters,
-                request.format.value
-            )
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported shader type: {request.shader_type}")
-        
-        # Get image metadata
-        metadata = service.get_image_metadata(image_id) or {}
         
-        return VisualizationResponse(
-            image_id=image_id,
-            image_url=f"/api/v1/images/{image_id}",
-            width=request.width,
-            height=request.height,
-            format=request.format,
-            created_at=metadata.get('created_at', ''),
-            metadata=metadata
+        # Render on the GL thread, off the event loop
+        image_id = await asyncio.get_running_loop().run_in_executor(
+            get_render_executor(), _render_request, service, request, input_textures
         )
         
+        # Serialize directly; skips FastAPI re-validating the model against response_model
+        return PydanticJSONResponse(_visualization_response(service, image_id, request))
+        
+    except HTTPException:
+        raise
     except VisualizationError as e:
         logger.error(f"Visualization error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -112,15 +155,77 @@ async def visualize_shader(request: VisualizationRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/", response_model=VisualizationResponse)
+async def visualize_shader(request: VisualizationRequest):
+    """
+    Visualize a shader by rendering it to an image.
+    
+    Args:
+        request: Visualization request with shader data and parameters
+        
+    Returns:
+        Visualization response with image ID and metadata
+    """
+    # Convert input textures from base64 if provided
+    return await _visualize(request, request.input_textures or {}, _decode_texture)
+
+
+@router.post("/multipart", response_model=VisualizationResponse)
+async def visualize_shader_multipart(
+    shader_type: ShaderType = Form(..., description="Type of shader to visualize"),
+    shader_source: str = Form(..., description="Shader source code or data"),
+    width: int = Form(512, ge=64, le=4096, description="Image width"),
+    height: int = Form(512, ge=64, le=4096, description="Image height"),
+    format: ImageFormat = Form(ImageFormat.PNG, description="Output image format"),
+    parameters: Optional[str] = Form(None, description="Shader parameters as a JSON object"),
+    textures: List[UploadFile] = File([], description="Input textures; each file's name is its texture name")
+):
+    """
+    Visualize a shader with textures uploaded as binary files.
+    
+    Preferred over the JSON route for large textures: nothing is base64 encoded,
+    and each texture is decoded directly from its upload.
+    
+    Returns:
+        Visualization response with image ID and metadata
+    """
+    try:
+        shader_parameters = json.loads(parameters) if parameters else None
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid parameters JSON")
+    if shader_parameters is not None and not isinstance(shader_parameters, dict):
+        raise HTTPException(status_code=400, detail="Parameters must be a JSON object")
+    
+    # Fields were validated by the Form declarations above
+    request = VisualizationRequest.model_construct(
+        shader_type=shader_type,
+        shader_source=shader_source,
+        width=width,
+        height=height,
+        format=format,
+        parameters=shader_parameters,
+        input_textures=None
+    )
+    files = {
+        (upload.filename or f"texture{i}").rsplit(".", 1)[0]: upload.file
+        for i, upload in enumerate(textures)
+    }
+    return await _visualize(request, files, _open_texture)
+
+
 @router.get("/images/{image_id}", response_class=Response)
 async def get_image(
+    http_request: Request,
     image_id: str = Path(..., description="Image ID"),
     format: Optional[ImageFormat] = Query(None, description="Requested image format")
 ):
     """
     Get a generated image by ID.
     
+    Without an explicit format, clients that accept image/webp get lossless WebP.
+    
     Args:
+        http_request: Incoming request, for the Accept header
         image_id: Unique identifier for the image
         format: Optional format conversion
         
@@ -135,23 +240,31 @@ async def get_image(
         if not image_data:
             raise HTTPException(status_code=404, detail="Image not found")
         
-        # Convert format if requested
+        # Get metadata for the stored format
+        metadata = service.get_image_metadata(image_id) or {}
+        image_format = metadata.get('format', 'PNG')
+        
+        # An explicit format wins; otherwise negotiate WebP from the Accept header
         if format:
-            converted_data = service.convert_image_format(image_id, format.value)
+            target_format = format.value
+        elif _accepts_webp(http_request):
+            target_format = ImageFormat.WEBP.value
+        else:
+            target_format = image_format
+        
+        # Convert format if it differs from the stored one, encoding off the event loop
+        if target_format.upper() != image_format.upper():
+            converted_data = await asyncio.to_thread(service.convert_image_format, image_id, target_format)
             if not converted_data:
                 raise HTTPException(status_code=400, detail="Failed to convert image format")
             image_data = converted_data
         
-        # Get metadata for content type
-        metadata = service.get_image_metadata(image_id) or {}
-        image_format = metadata.get('format', 'PNG')
-        
-        content_type = f"image/{image_format.lower()}"
+        content_type = f"image/{target_format.lower()}"
         
         return Response(
             content=image_data,
             media_type=content_type,
-            headers={"Cache-Control": "public, max-age=3600"}
+            headers={"Cache-Control": "public, max-age=3600", "Vary": "Accept"}
         )
         
     except HTTPException:
@@ -179,7 +292,7 @@ async def list_images(
     try:
         service = get_visualization_service()
         
-        # Get all images
+        # Get all images (the service keeps this list between requests)
         all_images = service.list_images()
         total_count = len(all_images)
         
@@ -188,10 +301,9 @@ async def list_images(
         end_idx = start_idx + page_size
         paginated_images = all_images[start_idx:end_idx]
         
-        # Convert to ImageInfo models
-        image_infos = []
-        for img_data in paginated_images:
-            image_infos.append(ImageInfo(
+        # Convert only this page to ImageInfo models (service-built, so skip re-validation)
+        image_infos = [
+            ImageInfo.model_construct(
                 id=img_data['id'],
                 width=img_data['width'],
                 height=img_data['height'],
@@ -199,15 +311,20 @@ async def list_images(
                 created_at=img_data['created_at'],
                 data_size=img_data['data_size'],
                 metadata=img_data.get('metadata', {})
-            ))
+            )
+            for img_data in paginated_images
+        ]
         
-        return ImageListResponse(
+        response = ImageListResponse.model_construct(
             images=image_infos,
             total_count=total_count,
             page=page,
             page_size=page_size
         )
         
+        # Serialize directly; skips FastAPI re-validating the model against response_model
+        return PydanticJSONResponse(response)
+        
     except Exception as e:
         logger.error(f"Error listing images: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -216,13 +333,17 @@ async def list_images(
 @router.post("/images/{image_id}/thumbnail", response_class=Response)
 async def create_thumbnail(
     request: ThumbnailRequest,
+    http_request: Request,
     image_id: str = Path(..., description="Image ID")
 ):
     """
     Create a thumbnail of an image.
     
+    Thumbnails are PNG, or lossless WebP for clients that accept image/webp.
+    
     Args:
         request: Thumbnail request with dimensions
+        http_request: Incoming request, for the Accept header
         image_id: Image ID
         
     Returns:
@@ -230,11 +351,14 @@ async def create_thumbnail(
     """
     try:
         service = get_visualization_service()
+        thumbnail_format = ImageFormat.WEBP if _accepts_webp(http_request) else ImageFormat.PNG
         
-        # Create thumbnail
-        thumbnail_data = service.create_thumbnail(
+        # Create thumbnail, encoding off the event loop
+        thumbnail_data = await asyncio.to_thread(
+            service.create_thumbnail,
             image_id, 
-            (request.width, request.height)
+            (request.width, request.height),
+            thumbnail_format.value
         )
         
         if not thumbnail_data:
@@ -242,8 +366,8 @@ async def create_thumbnail(
         
         return Response(
             content=thumbnail_data,
-            media_type="image/png",
-            headers={"Cache-Control": "public, max-age=3600"}
+            media_type=f"image/{thumbnail_format.value.lower()}",
+            headers={"Cache-Control": "public, max-age=3600", "Vary": "Accept"}
         )
         
     except HTTPException:
@@ -355,60 +479,39 @@ async def batch_visualize(request: BatchVisualizationRequest):
     try:
         service = get_visualization_service()
         
-        # For now, process sequentially (can be enhanced with async processing)
+        # Queue every render on the GL thread at once; it works through them off the event loop
+        loop = asyncio.get_running_loop()
+        executor = get_render_executor()
+        
+        async def render(shader_request: VisualizationRequest) -> str:
+            """Decode one entry's textures, then render it on the GL thread."""
+            input_textures = None
+            if shader_request.input_textures:
+                input_textures = await _decode_textures(shader_request.input_textures, _decode_texture)
+            return await loop.run_in_executor(
+                executor, _render_request, service, shader_request, input_textures
+            )
+        
+        # A shader whose textures do not decode fails on its own, like a failed render
+        outcomes = await asyncio.gather(
+            *[render(shader_request) for shader_request in request.shaders],
+            return_exceptions=True
+        )
+        
         results = []
         completed = 0
         failed = 0
         
-        for shader_request in request.shaders:
-            try:
-                # Convert to individual visualization request
-                if shader_request.shader_type == ShaderType.GLSL:
-                    image_id, _ = service.render_glsl_shader(
-                        shader_request.shader_source,
-                        shader_request.width,
-                        shader_request.height,
-                        shader_request.parameters,
-                        shader_request.format.value
-                    )
-                elif shader_request.shader_type == ShaderType.ISF:
-                    isf_data = json.loads(shader_request.shader_source)
-                    image_id, _ = service.render_isf_shader(
-                        isf_data,
-                        shader_request.width,
-                        shader_request.height,
-                        shader_request.parameters,
-                        shader_request.format.value
-                    )
-                else:
-                    # Treat as GLSL
-                    image_id, _ = service.render_glsl_shader(
-                        shader_request.shader_source,
-                        shader_request.width,
-                        shader_request.height,
-                        shader_request.parameters,
-                        shader_request.format.value
-                    )
-                
-                # Get metadata
-                metadata = service.get_image_metadata(image_id) or {}
-                
-                results.append(VisualizationResponse(
-                    image_id=image_id,
-                    image_url=f"/api/v1/images/{image_id}",
-                    width=shader_request.width,
-                    height=shader_request.height,
-                    format=shader_request.format,
-                    created_at=metadata.get('created_at', ''),
-                    metadata=metadata
-                ))
-                completed += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to visualize shader in batch: {e}")
+        for shader_request, outcome in zip(request.shaders, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to visualize shader in batch: {outcome}")
                 failed += 1
+                continue
+            
+            results.append(_visualization_response(service, outcome, shader_request))
+            completed += 1
         
-        return BatchVisualizationResponse(
+        response = BatchVisualizationResponse.model_construct(
             batch_id=f"batch_{len(results)}",
             total_shaders=len(request.shaders),
             completed=completed,
@@ -417,6 +520,9 @@ async def batch_visualize(request: BatchVisualizationRequest):
             status="completed" if failed == 0 else "partial"
         )
         
+        # Serialized in one pass over the whole batch
+        return PydanticJSONResponse(response)
+        
     except Exception as e:
         logger.error(f"Error in batch visualization: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -5,11 +5,13 @@ This module manages WebSocket connections for real-time validation feedback.
 """
 
 import logging
-import json
 import asyncio
-from typing import Dict, Set, Optional, Any
-from datetime import datetime
+import time
+from typing import Dict, Set, Optional, Any, List, Tuple
+from datetime import datetime, timedelta
 import uuid
+from dataclasses import dataclass
+import orjson
 
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
@@ -17,6 +19,21 @@ from fastapi.websockets import WebSocketState
 logger = logging.getLogger(__name__)
 
 
+def _encode_message(message: Dict[str, Any]) -> str:
+    """Encode a message for a text frame (non-string keys are stringified, as json.dumps did)."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+@dataclass(slots=True)
+class ConnectionMetadata:
+    """Per-connection bookkeeping; last_activity is time.monotonic(), see get_last_activity."""
+    connected_at: datetime
+    last_activity: float
+    client_id: Optional[str]
+    status: str = 'connected'
+    disconnected_at: Optional[datetime] = None
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections for real-time communication.
@@ -28,10 +45,11 @@ class ConnectionManager:
     def __init__(self):
         """Initialize the connection manager."""
         self.active_connections: Dict[str, WebSocket] = {}
-        self.connection_metadata: Dict[str, Dict[str, Any]] = {}
+        self.connection_metadata: Dict[str, ConnectionMetadata] = {}
         self.connection_groups: Dict[str, Set[str]] = {}
         self.max_connections = 100
         self.connection_timeout = 3600  # 1 hour
+        self.send_timeout = 5  # seconds a single fan-out send may take
     
     async def connect(self, websocket: WebSocket, client_id: Optional[str] = None) -> str:
         """
@@ -57,12 +75,11 @@ class ConnectionManager:
             
             # Store connection
             self.active_connections[connection_id] = websocket
-            self.connection_metadata[connection_id] = {
-                'connected_at': datetime.utcnow().isoformat(),
-                'last_activity': datetime.utcnow().isoformat(),
-                'client_id': client_id,
-                'status': 'connected'
-            }
+            self.connection_metadata[connection_id] = ConnectionMetadata(
+                connected_at=datetime.utcnow(),
+                last_activity=time.monotonic(),
+                client_id=client_id
+            )
             
             logger.info(f"WebSocket connected: {connection_id}")
             
@@ -104,9 +121,10 @@ class ConnectionManager:
                         connections.remove(connection_id)
                 
                 # Clean up metadata
-                if connection_id in self.connection_metadata:
-                    self.connection_metadata[connection_id]['status'] = 'disconnected'
-                    self.connection_metadata[connection_id]['disconnected_at'] = datetime.utcnow().isoformat()
+                metadata = self.connection_metadata.get(connection_id)
+                if metadata is not None:
+                    metadata.status = 'disconnected'
+                    metadata.disconnected_at = datetime.utcnow()
                 
                 logger.info(f"WebSocket disconnected: {connection_id}")
                 
@@ -126,11 +144,12 @@ class ConnectionManager:
                 websocket = self.active_connections[connection_id]
                 
                 if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_text(json.dumps(message))
+                    await websocket.send_text(_encode_message(message))
                     
                     # Update last activity
-                    if connection_id in self.connection_metadata:
-                        self.connection_metadata[connection_id]['last_activity'] = datetime.utcnow().isoformat()
+                    metadata = self.connection_metadata.get(connection_id)
+                    if metadata is not None:
+                        metadata.last_activity = time.monotonic()
                 else:
                     # Connection is no longer active, clean up
                     await self.disconnect(connection_id)
@@ -149,31 +168,66 @@ class ConnectionManager:
             message: Message to broadcast
             exclude: Connection ID to exclude from broadcast
         """
-        disconnected_connections = []
+        # Snapshot the recipients; connections may come and go while sends are in flight
+        targets = [
+            (connection_id, websocket)
+            for connection_id, websocket in self.active_connections.items()
+            if connection_id != exclude
+        ]
         
-        for connection_id, websocket in self.active_connections.items():
-            if connection_id == exclude:
-                continue
-                
-            try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_text(json.dumps(message))
-                    
-                    # Update last activity
-                    if connection_id in self.connection_metadata:
-                        self.connection_metadata[connection_id]['last_activity'] = datetime.utcnow().isoformat()
-                else:
-                    disconnected_connections.append(connection_id)
-                    
-            except WebSocketDisconnect:
-                disconnected_connections.append(connection_id)
-            except Exception as e:
-                logger.error(f"Error broadcasting to {connection_id}: {e}")
-                disconnected_connections.append(connection_id)
+        await self._fan_out(targets, _encode_message(message))
+    
+    async def _fan_out(self, targets: List[Tuple[str, WebSocket]], payload: str):
+        """
+        Send one encoded message to several connections concurrently.
         
-        # Clean up disconnected connections
-        for connection_id in disconnected_connections:
-            await self.disconnect(connection_id)
+        A slow client only delays itself; connections that fail are disconnected afterwards.
+        
+        Args:
+            targets: (connection ID, WebSocket) pairs to send to
+            payload: Encoded message
+        """
+        delivered = await asyncio.gather(*[
+            self._send_payload(connection_id, websocket, payload)
+            for connection_id, websocket in targets
+        ])
+        
+        # One activity time for the whole fan-out
+        now = time.monotonic()
+        for (connection_id, _), ok in zip(targets, delivered):
+            if not ok:
+                # Clean up disconnected (or stalled) connections
+                await self.disconnect(connection_id)
+            else:
+                metadata = self.connection_metadata.get(connection_id)
+                if metadata is not None:
+                    metadata.last_activity = now
+    
+    async def _send_payload(self, connection_id: str, websocket: WebSocket, payload: str) -> bool:
+        """
+        Send an encoded message to one connection within send_timeout.
+        
+        Args:
+            connection_id: Connection identifier
+            websocket: The connection's WebSocket
+            payload: Encoded message
+            
+        Returns:
+            False if the connection is gone or failed to take the message in time
+        """
+        if websocket.client_state != WebSocketState.CONNECTED:
+            return False
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), timeout=self.send_timeout)
+            return True
+        except WebSocketDisconnect:
+            return False
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out sending to {connection_id}")
+            return False
+        except Exception as e:
+            logger.error(f"Error sending to {connection_id}: {e}")
+            return False
     
     async def send_to_group(self, group_name: str, message: Dict[str, Any], exclude: Optional[str] = None):
         """
@@ -184,10 +238,15 @@ class ConnectionManager:
             message: Message to send
             exclude: Connection ID to exclude
         """
-        if group_name in self.connection_groups:
-            for connection_id in self.connection_groups[group_name].copy():
-                if connection_id != exclude:
-                    await self.send_personal_message(connection_id, message)
+        # Snapshot the members; the group may change while sends are in flight
+        members = tuple(self.connection_groups.get(group_name, ()))
+        targets = [
+            (connection_id, self.active_connections[connection_id])
+            for connection_id in members
+            if connection_id != exclude and connection_id in self.active_connections
+        ]
+        if targets:
+            await self._fan_out(targets, _encode_message(message))
     
     def add_to_group(self, connection_id: str, group_name: str):
         """
@@ -225,11 +284,32 @@ class ConnectionManager:
         Returns:
             Connection information or None if not found
         """
-        if connection_id in self.connection_metadata:
-            info = self.connection_metadata[connection_id].copy()
-            info['active'] = connection_id in self.active_connections
-            return info
-        return None
+        metadata = self.connection_metadata.get(connection_id)
+        if metadata is None:
+            return None
+        info = {
+            'connected_at': metadata.connected_at.isoformat(),
+            'last_activity': self.get_last_activity(connection_id),
+            'client_id': metadata.client_id,
+            'status': metadata.status
+        }
+        if metadata.disconnected_at is not None:
+            info['disconnected_at'] = metadata.disconnected_at.isoformat()
+        info['active'] = connection_id in self.active_connections
+        return info
+    
+    def get_last_activity(self, connection_id: str) -> str:
+        """
+        Get a connection's last activity time as an ISO timestamp.
+        
+        Args:
+            connection_id: Connection identifier
+            
+        Returns:
+            ISO formatted UTC time of the last message sent to the connection
+        """
+        idle = time.monotonic() - self.connection_metadata[connection_id].last_activity
+        return (datetime.utcnow() - timedelta(seconds=idle)).isoformat()
     
     def get_active_connections_count(self) -> int:
         """Get the number of active connections."""
@@ -259,13 +339,12 @@ class ConnectionManager:
     
     async def cleanup_inactive_connections(self):
         """Clean up inactive connections."""
-        current_time = datetime.utcnow()
+        current_time = time.monotonic()
         inactive_connections = []
         
         for connection_id, metadata in self.connection_metadata.items():
-            if metadata['status'] == 'connected':
-                last_activity = datetime.fromisoformat(metadata['last_activity'])
-                if (current_time - last_activity).total_seconds() > self.connection_timeout:
+            if metadata.status == 'connected':
+                if current_time - metadata.last_activity > self.connection_timeout:
                     inactive_connections.append(connection_id)
         
         for connection_id in inactive_connections:
@@ -360,7 +360,7 @@ async def handle_join_group(connection_id: str, message: Dict[str, Any]):
         await connection_manager.send_personal_message(connection_id, {
             'type': 'group_joined',
             'group_name': group_name,
-            'timestamp': connection_manager.connection_metadata[connection_id]['last_activity']
+            'timestamp': connection_manager.get_last_activity(connection_id)
         })
         
     except Exception as e:
@@ -396,7 +396,7 @@ async def handle_leave_group(connection_id: str, message: Dict[str, Any]):
         await connection_manager.send_personal_message(connection_id, {
             'type': 'group_left',
             'group_name': group_name,
-            'timestamp': connection_manager.connection_metadata[connection_id]['last_activity']
+            'timestamp': connection_manager.get_last_activity(connection_id)
         })
         
     except Exception as e:
@@ -419,7 +419,7 @@ async def handle_ping(connection_id: str, message: Dict[str, Any]):
         # Send pong response
         await connection_manager.send_personal_message(connection_id, {
             'type': 'pong',
-            'timestamp': connection_manager.connection_metadata[connection_id]['last_activity'],
+            'timestamp': connection_manager.get_last_activity(connection_id),
             'connection_id': connection_id
         })
         
@@ -31,6 +31,9 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Request scanning/sanitization middleware; off by default because its
+    # command-injection pattern matches ';', which every shader contains
+    enable_security_middleware: bool = False
     
     # CORS
     allowed_origins: List[str] = ["*"]
@@ -49,6 +52,7 @@ class Settings(BaseSettings):
     max_shader_size: int = 1024 * 1024  # 1MB
     max_batch_size: int = 10
     validation_timeout: int = 30  # seconds
+    validation_cache_size: int = 1024  # cached results per process
     
     # Rendering
     default_image_width: int = 512
@@ -193,9 +193,9 @@ class ShaderRenderer:
                 
                 # Bind input textures
                 if input_textures:
-                    for uniform_name, texture_name in input_textures.items():
+                    # Each texture gets its own unit
+                    for texture_unit, (uniform_name, texture_name) in enumerate(input_textures.items()):
                         if texture_name in self._textures:
-                            texture_unit = len(input_textures) - 1
                             gl.glActiveTexture(gl.GL_TEXTURE0 + texture_unit)
                             gl.glBindTexture(gl.GL_TEXTURE_2D, self._textures[texture_name])
                             gl.glUniform1i(
@@ -267,9 +267,9 @@ class ShaderRenderer:
                 
                 # Bind input textures
                 if input_textures:
-                    for uniform_name, texture_name in input_textures.items():
+                    # Each texture gets its own unit
+                    for texture_unit, (uniform_name, texture_name) in enumerate(input_textures.items()):
                         if texture_name in self._textures:
-                            texture_unit = len(input_textures) - 1
                             gl.glActiveTexture(gl.GL_TEXTURE0 + texture_unit)
                             gl.glBindTexture(gl.GL_TEXTURE_2D, self._textures[texture_name])
                             gl.glUniform1i(
@@ -27,11 +27,11 @@ def bytes_to_pil_image(image_data: bytes) -> Image.Image:
         raise ImageProcessingError(f"Failed to convert bytes to PIL Image: {e}")
 
 
-def pil_image_to_bytes(image: Image.Image, format: str = 'PNG') -> bytes:
-    """Convert PIL Image to bytes."""
+def pil_image_to_bytes(image: Image.Image, format: str = 'PNG', **save_options) -> bytes:
+    """Convert PIL Image to bytes, passing any encoder options through to Pillow."""
     try:
         buffer = io.BytesIO()
-        image.save(buffer, format=format)
+        image.save(buffer, format=format, **save_options)
         return buffer.getvalue()
     except Exception as e:
         logger.error(f"Failed to convert PIL Image to bytes: {e}")
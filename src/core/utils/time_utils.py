@@ -0,0 +1,34 @@
+"""
+Time utility functions
+"""
+import time
+from datetime import datetime
+from typing import Tuple
+
+# Timestamps served from the cache are at most this many seconds old
+CLOCK_RESOLUTION = 1.0
+
+# (epoch seconds, naive UTC datetime, ISO string) of the last refresh
+_cached_now: Tuple[float, datetime, str] = (0.0, datetime.min, datetime.min.isoformat())
+
+
+def _current() -> Tuple[float, datetime, str]:
+    """Return the cached clock reading, refreshing it when older than the resolution."""
+    global _cached_now
+    now = time.time()
+    cached = _cached_now
+    if now - cached[0] >= CLOCK_RESOLUTION:
+        current = datetime.utcfromtimestamp(now)
+        cached = (now, current, current.isoformat())
+        _cached_now = cached
+    return cached
+
+
+def utc_now() -> datetime:
+    """Coarse equivalent of datetime.utcnow() with CLOCK_RESOLUTION granularity."""
+    return _current()[1]
+
+
+def utc_now_iso() -> str:
+    """Coarse equivalent of datetime.utcnow().isoformat() with CLOCK_RESOLUTION granularity."""
+    return _current()[2]
@@ -3,7 +3,7 @@ Database connection management
 """
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from src.config.settings import settings
 
@@ -15,7 +15,9 @@ engine = create_engine(
     pool_pre_ping=True
 )
 
-SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+# One session per request: async routes share the event loop thread, so a
+# thread-scoped session would be shared by every request awaiting at once
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Dependency for FastAPI
 
@@ -2,14 +2,34 @@
 Database initialization script
 """
 
+from sqlalchemy import inspect, text, update, case
 from src.database.connection import engine
-from src.database.models import Base
+from src.database.models import Base, ValidationRecord
 
 def init_db():
     """Create all tables in the database."""
     Base.metadata.create_all(bind=engine)
+    add_validation_status_column()
+    # create_all skips tables that already exist, so add indexes introduced since
+    for index in ValidationRecord.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+def add_validation_status_column():
+    """Add validation_records.status to databases created before it, backfilled from is_valid."""
+    columns = {column["name"] for column in inspect(engine).get_columns(ValidationRecord.__tablename__)}
+    if "status" in columns:
+        return
+    with engine.begin() as connection:
+        connection.execute(text(f"ALTER TABLE {ValidationRecord.__tablename__} ADD COLUMN status VARCHAR"))
+        # A backfill, not an edit: keep each row's updated_at
+        connection.execute(update(ValidationRecord).values(status=case(
+            (ValidationRecord.is_valid.is_(None), "processing"),
+            (ValidationRecord.is_valid == False, "invalid"),
+            (ValidationRecord.warning_count > 0, "warning"),
+            else_="valid"
+        ), updated_at=ValidationRecord.updated_at))
 
 if __name__ == "__main__":
     print("Initializing database...")
     init_db()
-    print("Database initialized.") 
\ No newline at end of file
+    print("Database initialized.")
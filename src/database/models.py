@@ -2,7 +2,7 @@
 SQLAlchemy database models
 """
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 import uuid
@@ -33,6 +33,8 @@ class ValidationRecord(Base):
     target_version = Column(String, nullable=True)
     target_platforms = Column(String, nullable=True)
     is_valid = Column(Boolean, nullable=True)
+    # processing / valid / invalid / warning / error, set when the record is written
+    status = Column(String, nullable=True)
     error_count = Column(Integer, default=0)
     warning_count = Column(Integer, default=0)
     quality_score = Column(Float, nullable=True)
@@ -41,6 +43,12 @@ class ValidationRecord(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# Indexes backing the history endpoint's filters, each ordered for its newest-first sort
+Index("ix_vr_created", ValidationRecord.created_at.desc(), ValidationRecord.id.desc())
+Index("ix_vr_user_created", ValidationRecord.user_id, ValidationRecord.created_at.desc())
+Index("ix_vr_format_created", ValidationRecord.format, ValidationRecord.created_at.desc())
+Index("ix_vr_status_created", ValidationRecord.status, ValidationRecord.created_at.desc())
+
 class ValidationHistory(Base):
     """Model for storing validation history."""
     __tablename__ = "validation_history"
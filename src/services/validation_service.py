@@ -14,12 +14,28 @@ from src.core.analyzers.isf_analyzer import ISFAnalyzer
 from src.core.analyzers.madmapper_analyzer import MadMapperAnalyzer
 from src.core.utils.gl_utils import GLVersionDetector, GLSLFeatureChecker, GLPlatformUtils
 from src.core.models.errors import ValidationResult, ValidationError, ErrorSeverity
+from src.config.settings import settings
 from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+import hashlib
 import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import orjson
 
+# Bump whenever validation output changes so previously cached results are not served
+RESULT_CACHE_VERSION = 1
 
-class ValidationService:
-    """Service for orchestrating comprehensive shader validation."""
+
+class _Analyzers(threading.local):
+    """
+    The validation engine, analyzers, parsers and GL utilities of one thread.
+    
+    They keep per-run state (QualityAnalyzer clears and refills self.metrics),
+    so every thread builds its own set on first use instead of sharing one.
+    """
     
     def __init__(self):
         self.engine = ValidationEngine()
@@ -44,6 +60,25 @@ class ValidationService:
         # Initialize GL utilities
         self.version_detector = GLVersionDetector()
         self.feature_checker = GLSLFeatureChecker()
+
+
+class ValidationService:
+    """Service for orchestrating comprehensive shader validation."""
+    
+    def __init__(self):
+        # Analyzers are per thread, so validations run in parallel without a lock
+        self._analyzers = _Analyzers()
+        
+        # LRU of serialized results keyed by shader source and parameters
+        self._result_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self.result_cache_size = settings.validation_cache_size
+    
+    def __getattr__(self, name: str):
+        """Resolve analyzers, parsers and GL utilities to the calling thread's instances."""
+        if name == "_analyzers":
+            raise AttributeError(name)
+        return getattr(self._analyzers, name)
     
     def validate(self, code: str, format_name: str = "glsl", 
                  parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -51,6 +86,12 @@ class ValidationService:
         if parameters is None:
             parameters = {}
         
+        # Identical submissions are answered from the result cache
+        cache_key = self._result_cache_key(code, format_name, parameters)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+        
         # Default parameters
         target_version = parameters.get("target_version", "330")
         target_platforms = parameters.get("target_platforms", ["desktop", "mobile", "web"])
@@ -84,6 +125,8 @@ class ValidationService:
                 # For other formats, use the validation engine
                 engine_result = self.engine.validate_shader(code, format_name, parameters)
                 result.update(engine_result)
+            
+            self._cache_result(cache_key, result)
         
         except Exception as e:
             result["is_valid"] = False
@@ -587,8 +630,8 @@ class ValidationService:
         if len(result["warnings"]) > 5:
             recommendations.append("Consider addressing warnings to improve shader quality")
         
-        # Remove duplicates and return
-        return list(set(recommendations))
+        # Remove duplicates, keeping first-seen order so every worker process agrees
+        return list(dict.fromkeys(recommendations))
     
     def _generate_isf_recommendations(self, isf_result: Dict[str, Any]) -> List[str]:
         """Generate ISF-specific recommendations."""
@@ -651,19 +694,60 @@ class ValidationService:
         
         return recommendations
     
+    def _result_cache_key(self, code: str, format_name: str, parameters: Dict[str, Any]) -> Optional[str]:
+        """Build the result cache key, or None when the parameters cannot be canonicalized."""
+        try:
+            canonical_parameters = orjson.dumps(parameters, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return None
+        digest = hashlib.sha256(code.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+        digest.update(canonical_parameters)
+        return f"{RESULT_CACHE_VERSION}:{format_name.lower()}:{digest.hexdigest()}"
+    
+    def _get_cached_result(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of a cached result, or None on a miss."""
+        if cache_key is None:
+            return None
+        with self._result_cache_lock:
+            payload = self._result_cache.get(cache_key)
+            if payload is None:
+                return None
+            self._result_cache.move_to_end(cache_key)
+        return orjson.loads(payload)
+    
+    def _cache_result(self, cache_key: Optional[str], result: Dict[str, Any]):
+        """Store a serialized result, evicting the least recently used one at capacity."""
+        if cache_key is None or self.result_cache_size <= 0:
+            return
+        try:
+            payload = orjson.dumps(result)
+        except TypeError:
+            return
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = payload
+            self._result_cache.move_to_end(cache_key)
+            if len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
+    
+    def clear_result_cache(self):
+        """Drop every cached validation result."""
+        with self._result_cache_lock:
+            self._result_cache.clear()
+    
+    def validate_batch_entry(self, shader: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate one shader entry of a batch."""
+        result = self.validate(
+            shader.get("code", ""),
+            shader.get("format", "glsl"),
+            shader.get("parameters", {})
+        )
+        result["shader_id"] = shader.get("id", "unknown")
+        return result
+    
     def validate_batch(self, shaders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Validate multiple shaders in batch."""
-        results = []
-        for shader in shaders:
-            code = shader.get("code", "")
-            format_name = shader.get("format", "glsl")
-            parameters = shader.get("parameters", {})
-            
-            result = self.validate(code, format_name, parameters)
-            result["shader_id"] = shader.get("id", "unknown")
-            results.append(result)
-        
-        return results
+        return [self.validate_batch_entry(shader) for shader in shaders]
 
 
 # Global validation service instance
@@ -671,4 +755,45 @@ validation_service = ValidationService()
 
 def get_validation_service():
     """Return the global validation service instance."""
-    return validation_service 
\ No newline at end of file
+    return validation_service
+
+
+def validate_batch_entry(shader: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate one batch entry with this process's service (picklable pool target)."""
+    return validation_service.validate_batch_entry(shader)
+
+
+# Process pool for parallel batch validation (created and warmed at startup, else on first use)
+_process_pool = None
+
+# One worker per core; batch validation is CPU-bound
+PROCESS_POOL_WORKERS = os.cpu_count() or 1
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the process pool used for parallel batch validation."""
+    global _process_pool
+    if _process_pool is None:
+        # Spawned, not forked, so workers never inherit a lock held by a request thread
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+def _worker_ready() -> bool:
+    """No-op pool task; unpickling it imports this module and builds the worker's service."""
+    return True
+
+def warm_process_pool():
+    """Start every batch validation worker now, so the first parallel batch does not pay for spawning them."""
+    pool = get_process_pool()
+    # Each submit starts another worker while none is idle
+    for future in [pool.submit(_worker_ready) for _ in range(PROCESS_POOL_WORKERS)]:
+        future.result()
+
+def shutdown_process_pool():
+    """Shut down the batch validation process pool if it was started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None 
\ No newline at end of file
@@ -6,7 +6,10 @@ and image processing utilities.
 """
 
 import logging
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, Tuple, List
 from datetime import datetime
 import numpy as np
@@ -20,6 +23,17 @@ from src.core.utils.image_utils import (
 
 logger = logging.getLogger(__name__)
 
+# Pillow encoder options per output format
+_SAVE_OPTIONS = {
+    'WEBP': {'lossless': True, 'method': 4}
+}
+
+# Formats without an alpha channel, which need RGB input
+_OPAQUE_FORMATS = frozenset({'JPEG'})
+
+# Number of re-encoded images (conversions and thumbnails) kept in memory
+ENCODED_CACHE_SIZE = 256
+
 
 class VisualizationError(Exception):
     """Exception raised for visualization errors."""
@@ -39,6 +53,12 @@ class VisualizationService:
         self.renderer = ShaderRenderer()
         self._cache: Dict[str, bytes] = {}
         self._metadata: Dict[str, Dict[str, Any]] = {}
+        # LRU of re-encoded images, keyed by (image_id, format, size)
+        self._encoded: OrderedDict = OrderedDict()
+        # list_images() entries in creation order; None until built or after a removal
+        self._image_index: Optional[List[Dict[str, Any]]] = None
+        # Renders store images on the GL thread while list/clear run on the event loop
+        self._index_lock = threading.Lock()
     
     def render_shader(self, 
                      vertex_source: str, 
@@ -95,8 +115,7 @@ class VisualizationService:
             )
             
             # Store in cache
-            self._cache[image_id] = image_data
-            self._metadata[image_id] = {
+            metadata = {
                 'width': width,
                 'height': height,
                 'format': format,
@@ -105,6 +124,11 @@ class VisualizationService:
                 'uniforms': uniforms or {},
                 'input_textures': list(input_textures.keys()) if input_textures else []
             }
+            with self._index_lock:
+                self._cache[image_id] = image_data
+                self._metadata[image_id] = metadata
+                if self._image_index is not None:
+                    self._image_index.append(self._index_entry(image_id))
             
             logger.info(f"Rendered shader to image {image_id} ({width}x{height})")
             return image_id, image_data
@@ -123,7 +147,8 @@ class VisualizationService:
                          width: int = 512, 
                          height: int = 512,
                          parameters: Optional[Dict[str, Any]] = None,
-                         format: str = 'PNG') -> Tuple[str, bytes]:
+                         format: str = 'PNG',
+                         input_textures: Optional[Dict[str, np.ndarray]] = None) -> Tuple[str, bytes]:
         """
         Render an ISF shader to an image.
         
@@ -133,6 +158,7 @@ class VisualizationService:
             height: Image height
             parameters: Shader parameters
             format: Output image format
+            input_textures: Input textures as RGBA numpy arrays, keyed by sampler name
             
         Returns:
             Tuple of (image_id, image_data)
@@ -164,7 +190,8 @@ class VisualizationService:
             
             # Render the shader
             return self.render_shader(
-                vertex_source, fragment_source, width, height, uniforms, format=format
+                vertex_source, fragment_source, width, height, uniforms,
+                input_textures=input_textures, format=format
             )
             
         except Exception as e:
@@ -177,7 +204,8 @@ class VisualizationService:
                           width: int = 512, 
                           height: int = 512,
                           uniforms: Optional[Dict[str, Any]] = None,
-                          format: str = 'PNG') -> Tuple[str, bytes]:
+                          format: str = 'PNG',
+                          input_textures: Optional[Dict[str, np.ndarray]] = None) -> Tuple[str, bytes]:
         """
         Render a GLSL shader to an image.
         
@@ -187,6 +215,7 @@ class VisualizationService:
             height: Image height
             uniforms: Uniform values
             format: Output image format
+            input_textures: Input textures as RGBA numpy arrays, keyed by sampler name
             
         Returns:
             Tuple of (image_id, image_data)
@@ -214,7 +243,8 @@ class VisualizationService:
             
             # Render the shader
             return self.render_shader(
-                vertex_source, fragment_source, width, height, uniforms, format=format
+                vertex_source, fragment_source, width, height, uniforms,
+                input_textures=input_textures, format=format
             )
             
         except Exception as e:
@@ -280,6 +310,8 @@ class VisualizationService:
         """
         Convert a cached image to a different format.
         
+        Conversions are kept in a bounded LRU, so repeat requests skip the encode.
+        
         Args:
             image_id: Image ID
             format: Target format
@@ -287,35 +319,34 @@ class VisualizationService:
         Returns:
             Converted image data or None if not found
         """
-        try:
-            image_data = self._cache.get(image_id)
-            if not image_data:
-                return None
-            
-            # Convert to PIL Image
-            image = bytes_to_pil_image(image_data)
-            
-            # Convert format
-            converted_image = convert_format(image, format)
-            
-            # Convert back to bytes
-            return pil_image_to_bytes(converted_image, format)
-            
-        except Exception as e:
-            logger.error(f"Failed to convert image {image_id} to {format}: {e}")
-            return None
+        return self._encode(image_id, format.upper())
     
-    def create_thumbnail(self, image_id: str, size: Tuple[int, int] = (128, 128)) -> Optional[bytes]:
+    def create_thumbnail(self, image_id: str, size: Tuple[int, int] = (128, 128),
+                         format: str = 'PNG') -> Optional[bytes]:
         """
         Create a thumbnail of a cached image.
         
+        Thumbnails are kept in the same bounded LRU as format conversions.
+        
         Args:
             image_id: Image ID
             size: Thumbnail size
+            format: Thumbnail format
             
         Returns:
             Thumbnail image data or None if not found
         """
+        return self._encode(image_id, format.upper(), tuple(size))
+    
+    def _encode(self, image_id: str, format: str,
+                thumbnail_size: Optional[Tuple[int, int]] = None) -> Optional[bytes]:
+        """Re-encode a cached image, optionally as a thumbnail, through the encoded LRU."""
+        key = (image_id, format, thumbnail_size)
+        encoded = self._encoded.get(key)
+        if encoded is not None:
+            self._encoded.move_to_end(key)
+            return encoded
+        
         try:
             image_data = self._cache.get(image_id)
             if not image_data:
@@ -324,32 +355,45 @@ class VisualizationService:
             # Convert to PIL Image
             image = bytes_to_pil_image(image_data)
             
-            # Create thumbnail
-            image.thumbnail(size, Image.LANCZOS)
+            if thumbnail_size:
+                image.thumbnail(thumbnail_size, Image.LANCZOS)
+            if format in _OPAQUE_FORMATS and image.mode not in ('RGB', 'L'):
+                image = convert_format(image, 'RGB')
             
             # Convert back to bytes
-            return pil_image_to_bytes(image)
+            encoded = pil_image_to_bytes(image, format, **_SAVE_OPTIONS.get(format, {}))
             
         except Exception as e:
-            logger.error(f"Failed to create thumbnail for image {image_id}: {e}")
+            logger.error(f"Failed to encode image {image_id} as {format}: {e}")
             return None
+        
+        self._encoded[key] = encoded
+        if len(self._encoded) > ENCODED_CACHE_SIZE:
+            self._encoded.popitem(last=False)
+        return encoded
     
     def list_images(self) -> List[Dict[str, Any]]:
         """
         List all cached images with their metadata.
         
+        The index behind it is built once and kept up to date as images are
+        rendered; callers get their own copy of the list.
+        
         Returns:
             List of image information dictionaries
         """
-        images = []
-        for image_id, metadata in self._metadata.items():
-            image_info = {
-                'id': image_id,
-                'data_size': len(self._cache.get(image_id, b'')),
-                **metadata
-            }
-            images.append(image_info)
-        return images
+        with self._index_lock:
+            if self._image_index is None:
+                self._image_index = [self._index_entry(image_id) for image_id in self._metadata]
+            return list(self._image_index)
+    
+    def _index_entry(self, image_id: str) -> Dict[str, Any]:
+        """Build the list_images() entry for one cached image."""
+        return {
+            'id': image_id,
+            'data_size': len(self._cache.get(image_id, b'')),
+            **self._metadata[image_id]
+        }
     
     def clear_cache(self, image_id: Optional[str] = None):
         """
@@ -359,12 +403,19 @@ class VisualizationService:
             image_id: Specific image ID to clear, or None to clear all
         """
         if image_id:
-            self._cache.pop(image_id, None)
-            self._metadata.pop(image_id, None)
+            with self._index_lock:
+                self._cache.pop(image_id, None)
+                self._metadata.pop(image_id, None)
+                self._image_index = None
+            for key in [key for key in self._encoded if key[0] == image_id]:
+                del self._encoded[key]
             logger.info(f"Cleared image {image_id} from cache")
         else:
-            self._cache.clear()
-            self._metadata.clear()
+            with self._index_lock:
+                self._cache.clear()
+                self._metadata.clear()
+                self._image_index = None
+            self._encoded.clear()
             logger.info("Cleared all images from cache")
     
     def cleanup(self):
@@ -399,4 +450,25 @@ def cleanup_visualization_service():
     global _global_visualization_service
     if _global_visualization_service is not None:
         _global_visualization_service.cleanup()
-        _global_visualization_service = None 
\ No newline at end of file
+        _global_visualization_service = None
+
+
+# Single worker thread for rendering (created on first use). The renderer shares
+# one GL context, which is only current on one thread, so every render runs here
+_render_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_render_executor() -> ThreadPoolExecutor:
+    """Return the executor that runs shader renders."""
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gl-render")
+    return _render_executor
+
+
+def shutdown_render_executor():
+    """Shut down the render thread if it was started."""
+    global _render_executor
+    if _render_executor is not None:
+        _render_executor.shutdown(cancel_futures=True)
+        _render_executor = None
@@ -36,10 +36,10 @@ class TestValidationAPI:
         assert "created_at" in data
         assert "processing_time_ms" in data
     
-    def test_validate_isf_shader_success(self, client: TestClient, sample_isf_shader: dict):
+    def test_validate_isf_shader_success(self, client: TestClient, sample_isf_shader_json: str):
         """Test successful ISF shader validation."""
         request_data = {
-            "code": json.dumps(sample_isf_shader),
+            "code": sample_isf_shader_json,
             "format": "isf",
             "custom_parameters": {"time": 0.0}
         }
@@ -5,10 +5,11 @@ This module provides shared fixtures and configuration for all tests.
 """
 
 import pytest
+import copy
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from unittest.mock import Mock, patch
 
 from fastapi.testclient import TestClient
@@ -18,17 +19,8 @@ from src.services.validation_service import ValidationService
 from src.services.visualization_service import VisualizationService
 from src.services.analysis_service import AnalysisService
 
-
-@pytest.fixture
-def client() -> TestClient:
-    """Create a test client for the FastAPI application."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def sample_glsl_shader() -> str:
-    """Provide a sample GLSL shader for testing."""
-    return """
+# Immutable sample sources shared by the fixtures below
+_GLSL_SAMPLE = """
     #version 330 core
     
     uniform float time;
@@ -49,7 +41,29 @@ def sample_glsl_shader() -> str:
     """
 
 
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """Create a test client for the FastAPI application (shared per session)."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
 @pytest.fixture
+def app_overrides() -> Iterator[Dict[Any, Any]]:
+    """Snapshot app.dependency_overrides and restore them after the test."""
+    saved_overrides = dict(app.dependency_overrides)
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved_overrides)
+
+
+@pytest.fixture(scope="session")
+def sample_glsl_shader() -> str:
+    """Provide a sample GLSL shader for testing."""
+    return _GLSL_SAMPLE
+
+
+@pytest.fixture(scope="session")
 def sample_isf_shader() -> dict:
     """Provide a sample ISF shader for testing."""
     fixture_path = Path(__file__).parent / "fixtures" / "shaders" / "test_isf_shader.json"
@@ -57,7 +71,19 @@ def sample_isf_shader() -> dict:
         return json.load(f)
 
 
+@pytest.fixture(scope="session")
+def sample_isf_shader_json(sample_isf_shader: dict) -> str:
+    """Provide the sample ISF shader serialized once as JSON source."""
+    return json.dumps(sample_isf_shader)
+
+
 @pytest.fixture
+def mutable_isf_shader(sample_isf_shader: dict) -> dict:
+    """Provide a private copy of the sample ISF shader for tests that modify it."""
+    return copy.deepcopy(sample_isf_shader)
+
+
+@pytest.fixture(scope="session")
 def spherical_eye_shader() -> str:
     """Provide the SphericalEye ISF shader for testing."""
     fixture_path = Path(__file__).parent / "fixtures" / "shaders" / "spherical_eye.fs"
@@ -65,7 +91,7 @@ def spherical_eye_shader() -> str:
         return f.read()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_madmapper_shader() -> str:
     """Provide a sample MadMapper shader for testing."""
     fixture_path = Path(__file__).parent / "fixtures" / "shaders" / "test_madmapper_shader.mad"
@@ -73,19 +99,19 @@ def sample_madmapper_shader() -> str:
         return f.read()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def validation_service() -> ValidationService:
     """Provide a validation service instance for testing."""
     return ValidationService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def visualization_service() -> VisualizationService:
     """Provide a visualization service instance for testing."""
     return VisualizationService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def analysis_service() -> AnalysisService:
     """Provide an analysis service instance for testing."""
     return AnalysisService()
@@ -0,0 +1,141 @@
+"""
+Tests for the WebSocket connection manager
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from fastapi.websockets import WebSocketState
+from src.api.websocket import connection_manager
+from src.api.websocket.connection_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that records what is sent to it."""
+
+    def __init__(self):
+        self.client_state = WebSocketState.CONNECTING
+        self.sent = []
+
+    async def accept(self):
+        self.client_state = WebSocketState.CONNECTED
+
+    async def close(self, code=1000, reason=None):
+        self.client_state = WebSocketState.DISCONNECTED
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+
+@pytest.fixture
+def manager():
+    """Create an empty connection manager."""
+    return ConnectionManager()
+
+
+async def _connect(manager, client_id):
+    """Connect a fake client and drop its welcome message."""
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, client_id)
+    websocket.sent.clear()
+    return websocket
+
+
+class TestConnectionActivity:
+    """Test last-activity tracking."""
+
+    async def test_last_activity_is_reported_as_iso(self, manager):
+        """Test that the monotonic activity time is turned into an ISO timestamp on read."""
+        await _connect(manager, "a")
+
+        info = manager.get_connection_info("a")
+
+        assert isinstance(manager.connection_metadata["a"].last_activity, float)
+        assert abs((datetime.utcnow() - datetime.fromisoformat(info["last_activity"])).total_seconds()) < 5
+
+    async def test_connection_info_after_disconnect(self, manager):
+        """Test that connection info reports ISO timestamps and the disconnected state."""
+        await _connect(manager, "a")
+
+        await manager.disconnect("a")
+        info = manager.get_connection_info("a")
+
+        assert info["status"] == "disconnected"
+        assert info["active"] is False
+        assert info["client_id"] == "a"
+        assert datetime.fromisoformat(info["disconnected_at"]) >= datetime.fromisoformat(info["connected_at"])
+        assert manager.get_connection_info("missing") is None
+
+    async def test_idle_connections_are_cleaned_up(self, manager):
+        """Test that connections idle past the timeout are disconnected."""
+        websocket = await _connect(manager, "a")
+        await _connect(manager, "b")
+        manager.connection_metadata["a"].last_activity -= manager.connection_timeout + 1
+
+        await manager.cleanup_inactive_connections()
+
+        assert list(manager.active_connections) == ["b"]
+        assert websocket.client_state == WebSocketState.DISCONNECTED
+
+
+class TestMessageFanOut:
+    """Test sending one message to many connections."""
+
+    async def test_broadcast_encodes_once(self, manager, monkeypatch):
+        """Test that a broadcast is encoded once and reaches everyone but the excluded client."""
+        sockets = {client_id: await _connect(manager, client_id) for client_id in ("a", "b", "c")}
+        encoded = []
+        encode = connection_manager._encode_message
+        monkeypatch.setattr(connection_manager, "_encode_message",
+                            lambda message: encoded.append(message) or encode(message))
+
+        await manager.broadcast({"type": "notice", 1: "x"}, exclude="b")
+
+        assert len(encoded) == 1
+        assert sockets["a"].sent == sockets["c"].sent == [{"type": "notice", "1": "x"}]
+        assert sockets["b"].sent == []
+
+    async def test_stalled_client_does_not_hold_up_broadcast(self, manager):
+        """Test that a client that never takes the message is dropped after send_timeout."""
+        sockets = {client_id: await _connect(manager, client_id) for client_id in ("a", "slow", "c")}
+
+        async def never_sends(data):
+            await asyncio.sleep(60)
+        sockets["slow"].send_text = never_sends
+        manager.send_timeout = 0.05
+
+        await asyncio.wait_for(manager.broadcast({"type": "notice"}), timeout=1)
+
+        assert sockets["a"].sent == sockets["c"].sent == [{"type": "notice"}]
+        assert sorted(manager.active_connections) == ["a", "c"]
+
+    async def test_group_message_encodes_once(self, manager, monkeypatch):
+        """Test that a group message is encoded once for all members."""
+        sockets = {client_id: await _connect(manager, client_id) for client_id in ("a", "b", "c")}
+        for client_id in ("a", "b"):
+            manager.add_to_group(client_id, "shaders")
+        encoded = []
+        encode = connection_manager._encode_message
+        monkeypatch.setattr(connection_manager, "_encode_message",
+                            lambda message: encoded.append(message) or encode(message))
+
+        await manager.send_to_group("shaders", {"type": "notice"})
+
+        assert len(encoded) == 1
+        assert sockets["a"].sent == sockets["b"].sent == [{"type": "notice"}]
+        assert sockets["c"].sent == []
+
+    async def test_group_message_skips_excluded_and_drops_dead_members(self, manager):
+        """Test that a group send skips the excluded member and disconnects members that fail."""
+        sockets = {client_id: await _connect(manager, client_id) for client_id in ("a", "b", "dead")}
+        for client_id in sockets:
+            manager.add_to_group(client_id, "shaders")
+        sockets["dead"].client_state = WebSocketState.DISCONNECTED
+
+        await manager.send_to_group("shaders", {"type": "notice"}, exclude="b")
+
+        assert sockets["a"].sent == [{"type": "notice"}]
+        assert sockets["b"].sent == []
+        assert sorted(manager.active_connections) == ["a", "b"]
+        assert manager.connection_groups["shaders"] == {"a", "b"}
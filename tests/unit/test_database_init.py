@@ -0,0 +1,36 @@
+"""
+Tests for database initialization
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from src.database import init
+
+
+class TestStatusColumnMigration:
+    """Test adding the status column to existing databases."""
+
+    def test_existing_rows_are_backfilled(self, monkeypatch):
+        """Test that a table created without status gets the column and derived values."""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE validation_records (id VARCHAR PRIMARY KEY, format VARCHAR NOT NULL, "
+                "is_valid BOOLEAN, warning_count INTEGER, updated_at DATETIME)"
+            ))
+            connection.execute(text(
+                "INSERT INTO validation_records VALUES "
+                "('a', 'glsl', NULL, 0, NULL), ('b', 'glsl', 0, 0, NULL), ('c', 'glsl', 1, 2, NULL), "
+                "('d', 'glsl', 1, 0, '2024-01-01 00:00:00.000000')"
+            ))
+        monkeypatch.setattr(init, "engine", engine)
+
+        init.add_validation_status_column()
+        init.add_validation_status_column()
+
+        with engine.connect() as connection:
+            rows = connection.execute(text("SELECT id, status, updated_at FROM validation_records ORDER BY id")).all()
+        assert [tuple(row) for row in rows] == [
+            ("a", "processing", None), ("b", "invalid", None), ("c", "warning", None),
+            ("d", "valid", "2024-01-01 00:00:00.000000")
+        ]
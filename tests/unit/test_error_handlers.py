@@ -0,0 +1,42 @@
+"""
+Tests for the API exception handlers
+"""
+
+import json
+from src.api.models.errors import (
+    ValidationException,
+    RateLimitException,
+    validation_exception_handler,
+    rate_limit_exception_handler,
+    general_exception_handler
+)
+
+
+class TestExceptionHandlers:
+    """Test error response bodies produced by the exception handlers."""
+
+    async def test_validation_error_body(self):
+        """Test that validation errors carry the detail, code and a timestamp."""
+        response = await validation_exception_handler(None, ValidationException("bad shader"))
+        body = json.loads(response.body)
+
+        assert response.status_code == 400
+        assert body["detail"] == "bad shader"
+        assert body["code"] == "VALIDATION_ERROR"
+        assert body["timestamp"]
+
+    async def test_rate_limit_sets_retry_after(self):
+        """Test that rate limit errors tell the client when to retry."""
+        response = await rate_limit_exception_handler(None, RateLimitException())
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "60"
+
+    async def test_general_error_hides_details(self):
+        """Test that unexpected errors do not leak exception text."""
+        response = await general_exception_handler(None, RuntimeError("secret"))
+        body = json.loads(response.body)
+
+        assert response.status_code == 500
+        assert "secret" not in response.body.decode()
+        assert body["code"] == "INTERNAL_ERROR"
@@ -0,0 +1,85 @@
+"""
+Tests for the health check routes
+"""
+
+import json
+import pytest
+from fastapi import HTTPException
+from src.api.routes import health
+
+
+class _CountingSession:
+    """Session stand-in that counts executed statements."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement):
+        if self.fail:
+            raise RuntimeError("connection refused")
+        self.executed.append(statement)
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Replace the session factory with one that records the sessions it opens."""
+    opened = []
+
+    def open_session(fail: bool = False):
+        session = _CountingSession(fail=fail or sessions.fail)
+        opened.append(session)
+        return session
+
+    sessions = type("Sessions", (), {"opened": opened, "fail": False})()
+    monkeypatch.setattr(health, "SessionLocal", open_session)
+    return sessions
+
+
+@pytest.fixture(autouse=True)
+def reset_health_cache():
+    """Start every test without a cached healthy ping."""
+    health.reset_health_cache()
+    yield
+    health.reset_health_cache()
+
+
+class TestDatabaseHealthCheck:
+    """Test the database health check endpoint."""
+
+    async def test_healthy_ping_is_cached(self, sessions):
+        """Test that a recent healthy ping is reused without opening a session."""
+        first = await health.db_health_check()
+        second = await health.db_health_check()
+
+        assert json.loads(first.body) == json.loads(second.body) == {"database": "healthy"}
+        assert first.media_type == "application/json"
+        assert len(sessions.opened) == 1
+        assert sessions.opened[0].executed == [health._PING]
+
+    async def test_expired_cache_pings_again(self, sessions, monkeypatch):
+        """Test that the database is pinged again once the TTL has passed."""
+        monkeypatch.setattr(health, "DB_HEALTH_TTL", 0)
+
+        await health.db_health_check()
+        await health.db_health_check()
+
+        assert len(sessions.opened) == 2
+
+    async def test_failure_invalidates_cache(self, sessions):
+        """Test that a failed ping returns 503 and clears the cached result."""
+        await health.db_health_check()
+
+        health._last_healthy = -health.DB_HEALTH_TTL
+        sessions.fail = True
+        with pytest.raises(HTTPException) as exc_info:
+            await health.db_health_check()
+
+        assert exc_info.value.status_code == 503
+        assert health._last_healthy is None
@@ -0,0 +1,43 @@
+"""
+Tests for loading the pre-baked OpenAPI spec
+"""
+
+import orjson
+import pytest
+from src.api import main
+
+
+@pytest.fixture
+def spec_path(tmp_path, monkeypatch):
+    """Point the app at a temporary spec file and restore its schema afterwards."""
+    path = tmp_path / "openapi.json"
+    monkeypatch.setattr(main, "OPENAPI_SPEC_PATH", path)
+    monkeypatch.setattr(main.app, "openapi_schema", None)
+    return path
+
+
+class TestPrebuiltOpenAPI:
+    """Test that the baked spec replaces first-request generation."""
+
+    def test_matching_spec_is_served(self, spec_path):
+        """Test that a spec baked for this version is returned as-is."""
+        spec_path.write_bytes(orjson.dumps({"openapi": "3.1.0", "info": {"version": main.app.version}}))
+
+        main._load_prebuilt_openapi()
+
+        assert main.app.openapi()["openapi"] == "3.1.0"
+        assert main.app.openapi() is main.app.openapi_schema
+
+    def test_stale_spec_is_ignored(self, spec_path):
+        """Test that a spec baked for another version falls back to generation."""
+        spec_path.write_bytes(orjson.dumps({"openapi": "3.1.0", "info": {"version": "0.0.0"}}))
+
+        main._load_prebuilt_openapi()
+
+        assert main.app.openapi_schema is None
+
+    def test_missing_spec_is_ignored(self, spec_path):
+        """Test that the app still starts without a baked spec."""
+        main._load_prebuilt_openapi()
+
+        assert main.app.openapi_schema is None
@@ -0,0 +1,157 @@
+"""
+Tests for the rate limiting middleware
+"""
+
+import json
+import pytest
+from src.api.middleware.observability import ObservabilityMiddleware
+from src.api.middleware.rate_limiting import RateLimitMiddleware
+
+
+async def _dummy_app(scope, receive, send):
+    """Minimal ASGI app used as the wrapped application."""
+    return None
+
+
+class TestRateLimitMiddleware:
+    """Test rate limit window bookkeeping."""
+
+    def test_allows_requests_within_limit(self):
+        """Test that requests under the limit are allowed and recorded."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        middleware.rate_limit = 3
+
+        assert all(middleware._is_allowed("client") for _ in range(3))
+        assert len(middleware.requests["client"]) == 3
+
+    def test_blocks_requests_over_limit(self):
+        """Test that requests over the limit are rejected and not recorded."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        middleware.rate_limit = 2
+
+        assert middleware._is_allowed("client")
+        assert middleware._is_allowed("client")
+        assert not middleware._is_allowed("client")
+        assert len(middleware.requests["client"]) == 2
+
+    def test_expired_requests_are_evicted(self):
+        """Test that requests older than the window no longer count."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        middleware.rate_limit = 1
+        middleware.window_size = 0
+
+        assert middleware._is_allowed("client")
+        assert middleware._is_allowed("client")
+        assert len(middleware.requests["client"]) == 1
+
+    def test_clients_are_tracked_independently(self):
+        """Test that one client's usage does not affect another."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        middleware.rate_limit = 1
+
+        assert middleware._is_allowed("client-a")
+        assert not middleware._is_allowed("client-a")
+        assert middleware._is_allowed("client-b")
+
+    def test_idle_clients_are_collected(self):
+        """Test that the periodic sweep drops clients with expired windows."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        middleware.window_size = 0
+        middleware.gc_request_interval = 2
+
+        middleware._is_allowed("idle-client")
+        middleware._is_allowed("active-client")
+
+        assert "idle-client" not in middleware.requests
+        assert "active-client" in middleware.requests
+
+    def test_tracked_clients_are_capped(self):
+        """Test that the least recently seen client is evicted at capacity."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        middleware.max_tracked_clients = 2
+
+        middleware._is_allowed("client-a")
+        middleware._is_allowed("client-b")
+        middleware._is_allowed("client-a")
+        middleware._is_allowed("client-c")
+
+        assert list(middleware.requests) == ["client-a", "client-c"]
+
+    def test_client_id_prefers_forwarded_for(self):
+        """Test that the first X-Forwarded-For address identifies the client."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        scope = {
+            "headers": [(b"x-forwarded-for", b"10.0.0.1, 10.0.0.2")],
+            "client": ("127.0.0.1", 1234)
+        }
+
+        assert middleware._get_client_id(scope) == "10.0.0.1"
+
+    def test_client_id_falls_back_to_peer_address(self):
+        """Test that the socket peer address is used without a proxy header."""
+        middleware = RateLimitMiddleware(_dummy_app)
+
+        assert middleware._get_client_id({"headers": [], "client": ("127.0.0.1", 1234)}) == "127.0.0.1"
+        assert middleware._get_client_id({"headers": [], "client": None}) == "unknown"
+
+    async def test_rejected_request_returns_429(self):
+        """Test that a client over the limit receives a JSON 429 response."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        middleware.rate_limit = 0
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        await middleware({"type": "http", "path": "/api/v1/validate", "headers": [], "client": ("127.0.0.1", 1234)}, None, send)
+
+        assert messages[0]["status"] == 429
+        assert (b"retry-after", b"60") in messages[0]["headers"]
+        body = json.loads(messages[1]["body"])
+        assert body["code"] == "RATE_LIMIT_EXCEEDED"
+        assert "timestamp" in body
+
+    async def test_public_paths_skip_tracking(self):
+        """Test that health and docs requests are not counted against the client."""
+        middleware = RateLimitMiddleware(_dummy_app)
+        scope = {"type": "http", "path": "/api/v1/health", "headers": [], "client": ("127.0.0.1", 1234)}
+
+        await middleware(scope, None, None)
+
+        assert len(middleware.requests) == 0
+
+
+class TestObservabilityMiddleware:
+    """Test the combined rate limiting and logging middleware."""
+
+    async def test_adds_response_time_header(self):
+        """Test that allowed requests get an x-response-time header."""
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        middleware = ObservabilityMiddleware(app)
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/validate", "headers": [], "client": ("127.0.0.1", 1234)}
+        await middleware(scope, None, send)
+
+        header_names = [name for name, _ in messages[0]["headers"]]
+        assert b"x-response-time" in header_names
+        assert len(middleware.requests["127.0.0.1"]) == 1
+
+    async def test_rejects_over_limit(self):
+        """Test that the combined middleware still enforces the rate limit."""
+        middleware = ObservabilityMiddleware(_dummy_app)
+        middleware.rate_limit = 0
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/validate", "headers": [], "client": ("127.0.0.1", 1234)}
+        await middleware(scope, None, send)
+
+        assert messages[0]["status"] == 429
@@ -0,0 +1,45 @@
+"""
+Tests for the validation request models
+"""
+
+import pytest
+from pydantic import ValidationError
+from src.api.models.requests import ValidationRequest, ValidationHistoryRequest, ValidationFilter
+
+
+class TestRequestValidators:
+    """Test field validators on the request models."""
+
+    def test_glsl_version_is_checked(self):
+        """Test that only known GLSL versions are accepted for GLSL shaders."""
+        assert ValidationRequest(code="void main() {}", format="glsl", target_version="450").target_version == "450"
+
+        with pytest.raises(ValidationError, match="110, 120"):
+            ValidationRequest(code="void main() {}", format="glsl", target_version="999")
+
+    def test_glsl_version_ignored_for_other_formats(self):
+        """Test that the GLSL version check only applies to GLSL shaders."""
+        assert ValidationRequest(code="{}", format="isf", target_version="999").target_version == "999"
+
+    def test_history_filters_are_checked(self):
+        """Test that sort order and status must be known values."""
+        assert ValidationHistoryRequest(sort_order="asc", status="valid").sort_order == "asc"
+
+        with pytest.raises(ValidationError):
+            ValidationHistoryRequest(sort_order="sideways")
+        with pytest.raises(ValidationError):
+            ValidationHistoryRequest(status="unknown")
+
+    def test_filter_severity_is_checked(self):
+        """Test that severity must be a known level."""
+        assert ValidationFilter(severity="info").severity == "info"
+
+        with pytest.raises(ValidationError):
+            ValidationFilter(severity="fatal")
+
+    def test_history_sort_field_is_checked(self):
+        """Test that history can only be sorted by index-backed fields."""
+        assert ValidationHistoryRequest(sort_by="created_at").sort_by == "created_at"
+
+        with pytest.raises(ValidationError, match="created_at"):
+            ValidationHistoryRequest(sort_by="quality_score")
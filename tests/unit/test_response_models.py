@@ -0,0 +1,69 @@
+"""
+Tests for the API response models
+"""
+
+import json
+import subprocess
+import sys
+from pydantic import BaseModel
+from src.api.models import responses
+from src.core.utils.time_utils import utc_now
+
+
+class TestResponseModels:
+    """Test response model definitions."""
+
+    def test_schemas_built_at_import(self):
+        """Test that no model is left waiting on an unresolved forward reference."""
+        incomplete = [
+            name for name in responses.__all__
+            if issubclass(getattr(responses, name), BaseModel)
+            and not getattr(responses, name).__pydantic_complete__
+        ]
+
+        assert incomplete == []
+
+    def test_timestamp_defaults_to_utc_now(self):
+        """Test that response timestamps come from the shared coarse UTC clock."""
+        response = responses.HealthResponse(status="healthy", version="1.0.0", services={})
+
+        assert response.timestamp == utc_now()
+
+    def test_pydantic_json_response_renders_models(self):
+        """Test that models are rendered to JSON bytes without an intermediate dict."""
+        health = responses.HealthResponse(status="healthy", version="1.0.0", services={"db": "ok"})
+        response = responses.PydanticJSONResponse(health)
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == json.loads(health.model_dump_json())
+
+    def test_summary_error_frequencies_are_typed(self):
+        """Test that most common errors are validated into typed entries."""
+        summary = responses.ValidationSummary(
+            total_validations=1, valid_shaders=1, invalid_shaders=0, warning_shaders=0,
+            total_errors=0, total_warnings=0,
+            most_common_errors=[{"error_code": "SYNTAX_ERROR", "count": 3}],
+            average_quality_score=0.0, quality_distribution={},
+            average_processing_time_ms=0.0, fastest_validation_ms=0.0, slowest_validation_ms=0.0,
+            format_distribution={}
+        )
+
+        assert summary.most_common_errors[0] == responses.ErrorFrequency(error_code="SYNTAX_ERROR", count=3)
+
+    def test_error_response_is_shared(self):
+        """Test that validation and visualization models use the same error model."""
+        from src.api.models import visualization_requests
+
+        assert visualization_requests.ErrorResponse is responses.ErrorResponse
+        assert responses.ErrorResponse(error="bad", detail={"line": 3}).detail == {"line": 3}
+
+    def test_envelope_models_load_lazily(self):
+        """Test that unused envelope models are not built when responses is imported."""
+        code = (
+            "import sys, src.api.models.responses as r; "
+            "print('src.api.models.responses_envelopes' in sys.modules); "
+            "print(r.ValidationResponse.__module__)"
+        )
+        result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.split() == ["False", "src.api.models.responses_envelopes"]
@@ -0,0 +1,262 @@
+"""
+Tests for the security middleware
+"""
+
+import subprocess
+import sys
+import pytest
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from src.api.middleware.security import SecurityMiddleware, get_sanitized_body
+
+
+async def _echo_app(scope, receive, send):
+    """ASGI app that responds with the sanitized body from request state."""
+    request = Request(scope, receive)
+    await JSONResponse(get_sanitized_body(request))(scope, receive, send)
+
+
+def _http_scope(path: str = "/api/v1/validate", content_length: Optional[int] = None) -> dict:
+    """Build an HTTP scope for a JSON POST request."""
+    headers = [(b"content-type", b"application/json")]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode("ascii")))
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 1234)
+    }
+
+
+async def _call(middleware, chunks, path: str = "/api/v1/validate"):
+    """Send a body in chunks through the middleware and collect the response messages."""
+    pending = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    messages = []
+
+    async def receive():
+        return pending.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(_http_scope(path), receive, send)
+    return messages
+
+
+@pytest.fixture
+def middleware():
+    """Create a fresh security middleware instance."""
+    return SecurityMiddleware(_echo_app)
+
+
+class TestMaliciousPatterns:
+    """Test malicious pattern detection."""
+
+    def test_detects_patterns_case_insensitively(self, middleware):
+        """Test that patterns match regardless of case."""
+        assert middleware._check_malicious_patterns("<SCRIPT>alert(1)</SCRIPT>")
+        assert middleware._check_malicious_patterns("SELECT name FROM users")
+        assert middleware._check_malicious_patterns("../../etc/passwd")
+
+    def test_clean_content_passes(self, middleware):
+        """Test that benign content is not flagged."""
+        assert not middleware._check_malicious_patterns("vec4 color = vec4(1.0)")
+
+    def test_whitespace_runs_do_not_backtrack(self, middleware):
+        """Test that long whitespace runs after a SQL keyword are scanned in linear time."""
+        assert not middleware._check_malicious_patterns("select" + " " * 5000)
+
+    async def test_malicious_body_rejected_before_parsing(self, middleware):
+        """Test that a malicious raw body is rejected without reaching the app."""
+        messages = await _call(middleware, [b'{"shader": {"sources": ["<scr', b'ipt>alert(1)</script>"]}}'])
+
+        assert messages[0]["status"] == 400
+        assert b"Malicious content detected" in messages[1]["body"]
+        assert "127.0.0.1" in middleware.suspicious_ips
+
+    async def test_non_utf8_body_is_scanned(self, middleware):
+        """Test that bodies are scanned as bytes without requiring valid UTF-8."""
+        messages = await _call(middleware, [b'{"p": "\xff../../etc/passwd"}'])
+
+        assert b"Malicious content detected" in messages[1]["body"]
+
+    async def test_json_escaped_patterns_are_detected(self, middleware):
+        """Test that a pattern hidden behind JSON escapes is caught once the strings are decoded."""
+        for body in (b'{"p": "\\u003cscript>alert(1)"}', b'{"\\u003cscript>": 1}'):
+            messages = await _call(middleware, [body], path="/api/v1/images/1/resize")
+
+            assert b"Malicious content detected" in messages[1]["body"]
+
+    def test_combined_pattern_covers_every_pattern(self, middleware):
+        """Test that the merged regex has a named group for each pattern."""
+        assert set(middleware._combined_pattern.groupindex) == set(middleware.malicious_patterns)
+
+    def test_compiled_patterns_are_shared(self, middleware):
+        """Test that pattern compilation happens once and is reused by new instances."""
+        assert SecurityMiddleware(_echo_app)._combined_pattern is middleware._combined_pattern
+
+    def test_patterns_not_compiled_at_import(self):
+        """Test that importing the module does not compile the pattern tables."""
+        code = "import src.api.middleware.security as s; print(s._compiled_patterns is None)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "True"
+
+
+class TestAppWiring:
+    """Test installing the middleware in the application."""
+
+    def test_installed_only_when_enabled(self, monkeypatch):
+        """Test that the app's HTTP chain includes the middleware behind its setting."""
+        from src.api import main
+
+        monkeypatch.setattr(main.settings, "enable_security_middleware", False)
+        assert SecurityMiddleware not in main._http_middleware_classes()
+
+        monkeypatch.setattr(main.settings, "enable_security_middleware", True)
+        assert main._http_middleware_classes()[-1] is SecurityMiddleware
+
+
+class TestSanitization:
+    """Test request body sanitization."""
+
+    def test_sanitize_string_strips_control_chars(self, middleware):
+        """Test that control characters are removed and whitespace collapsed."""
+        assert middleware._sanitize_string("  a\x00b\x07c \n\t d  ") == "abc d"
+
+    def test_sanitize_data_walks_nested_containers(self, middleware):
+        """Test that strings nested in dicts and lists are sanitized in place."""
+        data = {"name": " a\x00b ", "params": [{"label": "x\x07y"}, 1.5, ["  z  "]]}
+
+        result = middleware._sanitize_data(data)
+
+        assert result is data
+        assert data == {"name": "ab", "params": [{"label": "xy"}, 1.5, ["z"]]}
+
+    async def test_clean_body_is_shared_with_handlers(self, middleware):
+        """Test that the parsed, sanitized body is exposed on request state."""
+        messages = await _call(middleware, [b'{"name": " a\\u0000', b'b "}'], path="/api/v1/")
+
+        assert messages[0]["status"] == 200
+        assert (b"x-frame-options", b"DENY") in messages[0]["headers"]
+        assert messages[1]["body"] == b'{"name":"ab"}'
+
+    def test_sanitization_is_gated_by_path(self, middleware):
+        """Test that only shader-consuming endpoints have their strings rewritten."""
+        body = b'{"name": "  a  "}'
+
+        assert middleware._sanitize_request_body("/api/v1/validate/batch", body) == {"name": "a"}
+        assert middleware._sanitize_request_body("/api/v1/images/1/resize", body) == {"name": "  a  "}
+
+
+    async def test_multipart_upload_is_passed_through(self):
+        """Test that texture uploads reach the app unscanned and unparsed, with the body intact."""
+        received = []
+
+        async def app(scope, receive, send):
+            received.append((await receive())["body"])
+            await JSONResponse({})(scope, receive, send)
+
+        body = b'--x\r\nContent-Disposition: form-data; name="textures"\r\n\r\n\x89PNG;|&\r\n--x--\r\n'
+        scope = _http_scope("/api/v1/multipart")
+        scope["headers"] = [(b"content-type", b"multipart/form-data; boundary=x")]
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await SecurityMiddleware(app)(scope, receive, send)
+
+        assert messages[0]["status"] == 200
+        assert received == [body]
+
+
+class TestIPTracking:
+    """Test blocked and suspicious IP bookkeeping."""
+
+    def test_suspicious_ips_are_capped(self, middleware):
+        """Test that the least recently seen IP is evicted at capacity."""
+        middleware.max_suspicious_ips = 2
+
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3"):
+            middleware._log_suspicious_activity(ip, "/api/v1/validate", "POST", "test")
+
+        assert list(middleware.suspicious_ips) == ["10.0.0.1", "10.0.0.3"]
+        assert middleware.suspicious_ips["10.0.0.1"]["count"] == 2
+
+    def test_activity_history_is_capped(self, middleware):
+        """Test that per-IP activity history keeps only recent entries."""
+        middleware.max_activities_per_ip = 3
+
+        for _ in range(5):
+            middleware._log_suspicious_activity("127.0.0.1", "/api/v1/validate", "POST", "test")
+
+        entry = middleware.suspicious_ips["127.0.0.1"]
+        assert entry["count"] == 5
+        assert len(entry["activities"]) == 3
+
+    def test_blocks_expire(self, middleware):
+        """Test that blocked IPs are released once the block expires."""
+        middleware._block_ip("10.0.0.1", now=0)
+        middleware._expire_blocks(middleware.block_duration - 1)
+        assert "10.0.0.1" in middleware.blocked_ips
+
+        middleware._expire_blocks(middleware.block_duration)
+        assert "10.0.0.1" not in middleware.blocked_ips
+
+
+class TestRequestSize:
+    """Test request and shader size limits."""
+
+    async def test_oversize_shader_rejected_before_body_read(self, middleware):
+        """Test that a declared oversize shader is rejected without reading the body."""
+        middleware.max_shader_size = 8
+
+        messages = []
+
+        async def receive():
+            raise AssertionError("body should not be read")
+
+        async def send(message):
+            messages.append(message)
+
+        await middleware(_http_scope(content_length=64), receive, send)
+
+        assert messages[0]["status"] == 400
+
+    async def test_streamed_body_stops_at_limit(self, middleware):
+        """Test that a body without Content-Length is cut off once it passes the limit."""
+        middleware.max_request_size = 8
+
+        messages = await _call(middleware, [b'{"a": ', b'"0123456789"}'], path="/api/v1/visualize")
+
+        assert messages[0]["status"] == 413
+
+    def test_shader_limit_only_applies_to_validation(self, middleware):
+        """Test that other endpoints are not held to the shader size limit."""
+        middleware.max_shader_size = 8
+        headers = Headers({"content-length": "64"})
+
+        assert not middleware._check_shader_size("/api/v1/validate", headers)
+        assert middleware._check_shader_size("/api/v1/visualize", headers)
+
+
+class TestContentType:
+    """Test content type filtering."""
+
+    def test_parameters_are_ignored(self, middleware):
+        """Test that media type parameters do not affect the check."""
+        assert middleware._check_content_type(Headers({"content-type": "application/json; charset=utf-8"}))
+        assert not middleware._check_content_type(Headers({"content-type": "application/xml"}))
+
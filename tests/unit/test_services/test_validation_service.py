@@ -0,0 +1,102 @@
+"""
+Tests for the validation service
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src.services import validation_service as service_module
+from src.services.validation_service import ValidationService
+
+SHADERS = [
+    "void main() { gl_FragColor = vec4(1.0); }",
+    "uniform float time;\nvoid main() { float x = sin(time); gl_FragColor = vec4(x); }",
+    "void main() { undefined_var = 1.0; }",
+]
+
+
+class TestValidationServiceConcurrency:
+    """Test that validations can be offloaded to worker threads."""
+
+    def test_concurrent_results_match_sequential(self):
+        """Test that validating from several threads gives the same results as one at a time."""
+        service = ValidationService()
+        service.result_cache_size = 0
+        sequential = [service.validate(code, "glsl") for code in SHADERS]
+
+        with ThreadPoolExecutor(max_workers=len(SHADERS)) as pool:
+            concurrent = list(pool.map(lambda code: service.validate(code, "glsl"), SHADERS * 4))
+
+        assert concurrent == sequential * 4
+
+    def test_analyzers_are_per_thread(self):
+        """Test that each thread validates with its own analyzers instead of waiting on a shared set."""
+        service = ValidationService()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            worker_analyzer = pool.submit(lambda: service.quality_analyzer).result()
+
+        assert service.quality_analyzer is service.quality_analyzer
+        assert worker_analyzer is not service.quality_analyzer
+
+
+class TestProcessPool:
+    """Test parallel batch validation in worker processes."""
+
+    def test_pool_results_match_in_process(self):
+        """Test that a worker process validates a batch entry like the local service."""
+        entry = {"id": "shader_0", "code": SHADERS[1], "format": "glsl", "parameters": {}}
+        try:
+            result = service_module.get_process_pool().submit(service_module.validate_batch_entry, entry).result()
+        finally:
+            service_module.shutdown_process_pool()
+
+        assert result == service_module.validation_service.validate_batch_entry(entry)
+        assert service_module._process_pool is None
+
+    def test_warm_pool_starts_every_worker(self):
+        """Test that warming the pool spawns all workers before any batch is submitted."""
+        try:
+            service_module.warm_process_pool()
+            workers = len(service_module._process_pool._processes)
+        finally:
+            service_module.shutdown_process_pool()
+
+        assert workers == service_module.PROCESS_POOL_WORKERS
+
+
+class TestResultCache:
+    """Test caching of validation results by shader source."""
+
+    def test_repeat_submission_is_served_from_cache(self, monkeypatch):
+        """Test that an identical submission reuses the first result."""
+        service = ValidationService()
+        first = service.validate(SHADERS[1], "glsl", {"target_version": "330"})
+        monkeypatch.setattr(service, "_validate_glsl", lambda *args: pytest.fail("validation re-ran"))
+
+        assert service.validate(SHADERS[1], "glsl", {"target_version": "330"}) == first
+
+    def test_parameters_are_part_of_the_key(self):
+        """Test that the same source with different parameters is validated separately."""
+        service = ValidationService()
+        service.validate(SHADERS[0], "glsl", {"target_version": "330"})
+        service.validate(SHADERS[0], "glsl", {"target_version": "450"})
+
+        assert len(service._result_cache) == 2
+
+    def test_cached_results_are_copies(self):
+        """Test that callers mutating a result do not change the cached entry."""
+        service = ValidationService()
+        service.validate(SHADERS[2], "glsl")["errors"].append("mutated")
+
+        assert "mutated" not in service.validate(SHADERS[2], "glsl")["errors"]
+
+    def test_least_recently_used_result_is_evicted(self):
+        """Test that the cache drops the least recently used result at capacity."""
+        service = ValidationService()
+        service.result_cache_size = 2
+
+        for code in (SHADERS[0], SHADERS[1], SHADERS[0], SHADERS[2]):
+            service.validate(code, "glsl")
+
+        cached = list(service._result_cache)
+        assert cached == [service._result_cache_key(code, "glsl", {}) for code in (SHADERS[0], SHADERS[2])]
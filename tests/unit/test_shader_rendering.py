@@ -2,14 +2,17 @@
 Tests for shader rendering system.
 """
 
+import io
+import threading
 import pytest
 import numpy as np
+from PIL import Image
 from unittest.mock import Mock, patch
 
 from src.core.renderers.shader_renderer import ShaderRenderer, ShaderRenderError
 from src.core.renderers.gl_context import GLContextManager, OpenGLContextError
 from src.services.visualization_service import VisualizationService, VisualizationError
-from src.core.utils.image_utils import numpy_to_pil_image, get_image_info
+from src.core.utils.image_utils import numpy_to_pil_image, pil_image_to_bytes, get_image_info
 
 
 class TestShaderRenderer:
@@ -109,6 +112,21 @@ class TestVisualizationService:
             assert image_id in service._cache
             assert image_id in service._metadata
     
+    def test_render_glsl_shader_with_textures(self):
+        """Test that input textures are uploaded and handed to the render."""
+        service = VisualizationService()
+        texture = np.zeros((2, 4, 4), dtype=np.uint8)
+        
+        with patch.object(service.renderer, 'compile_shader', return_value=True), \
+             patch.object(service.renderer, 'create_texture', return_value=True) as create_texture, \
+             patch.object(service.renderer, 'render_to_image', return_value=b'test_image_data') as render:
+            image_id, _ = service.render_glsl_shader("void main() {}", input_textures={'noise': texture})
+        
+        texture_id = f"texture_noise_{image_id}"
+        create_texture.assert_called_once_with(texture_id, 4, 2, texture)
+        assert render.call_args.args[3] == {'noise': texture_id}
+        assert service._metadata[image_id]['input_textures'] == ['noise']
+    
     def test_render_isf_shader(self):
         """Test rendering ISF shader."""
         service = VisualizationService()
@@ -197,6 +215,52 @@ class TestVisualizationService:
         assert test_id1 in image_ids
         assert test_id2 in image_ids
     
+    def test_list_images_index_follows_writes(self):
+        """Test that the image list is kept between calls and updated on render and clear."""
+        service = VisualizationService()
+        assert service.list_images() == []
+        
+        with patch.object(service.renderer, 'compile_shader', return_value=True), \
+             patch.object(service.renderer, 'render_to_image', return_value=b'test_image_data'):
+            first_id, _ = service.render_glsl_shader("void main() {}")
+            second_id, _ = service.render_glsl_shader("void main() {}")
+        
+        images = service.list_images()
+        assert [img['id'] for img in images] == [first_id, second_id]
+        assert images[0]['data_size'] == len(b'test_image_data')
+        assert service._image_index is not None
+        
+        # Callers get a copy, so changing it leaves the index alone
+        images.clear()
+        assert len(service.list_images()) == 2
+        
+        service.clear_cache(first_id)
+        assert [img['id'] for img in service.list_images()] == [second_id]
+    
+    def test_list_images_while_rendering_on_another_thread(self):
+        """Test that listing and clearing alongside renders on another thread stays consistent."""
+        service = VisualizationService()
+        errors = []
+        
+        def render():
+            try:
+                for _ in range(300):
+                    service.render_glsl_shader("void main() {}")
+            except Exception as e:
+                errors.append(e)
+        
+        with patch.object(service.renderer, 'compile_shader', return_value=True), \
+             patch.object(service.renderer, 'render_to_image', return_value=b'test_image_data'):
+            thread = threading.Thread(target=render)
+            thread.start()
+            while thread.is_alive():
+                service.list_images()
+                service.clear_cache()
+            thread.join()
+        
+        assert errors == []
+        assert [img['id'] for img in service.list_images()] == list(service._metadata)
+    
     def test_clear_cache(self):
         """Test clearing image cache."""
         service = VisualizationService()
@@ -219,6 +283,30 @@ class TestVisualizationService:
         assert len(service._cache) == 0
         assert len(service._metadata) == 0
     
+    def test_convert_image_format_is_cached(self):
+        """Test that format conversions encode once and are dropped with their image."""
+        service = VisualizationService()
+        service._cache['test_id'] = pil_image_to_bytes(numpy_to_pil_image(np.zeros((8, 8, 4), dtype=np.uint8)))
+        
+        webp_data = service.convert_image_format('test_id', 'WEBP')
+        assert Image.open(io.BytesIO(webp_data)).format == 'WEBP'
+        assert Image.open(io.BytesIO(service.convert_image_format('test_id', 'JPEG'))).mode == 'RGB'
+        
+        with patch('src.services.visualization_service.pil_image_to_bytes') as encode:
+            assert service.convert_image_format('test_id', 'WEBP') is webp_data
+            encode.assert_not_called()
+        
+        service.clear_cache('test_id')
+        assert service.convert_image_format('test_id', 'WEBP') is None
+    
+    def test_create_thumbnail_in_format(self):
+        """Test that thumbnails are resized and encoded in the requested format."""
+        service = VisualizationService()
+        service._cache['test_id'] = pil_image_to_bytes(numpy_to_pil_image(np.zeros((64, 64, 3), dtype=np.uint8)))
+        
+        thumbnail = Image.open(io.BytesIO(service.create_thumbnail('test_id', (16, 16), 'WEBP')))
+        assert (thumbnail.format, thumbnail.size) == ('WEBP', (16, 16))
+    
     def test_cleanup(self):
         """Test visualization service cleanup."""
         service = VisualizationService()
@@ -0,0 +1,23 @@
+"""
+Tests for time utility functions
+"""
+
+from datetime import datetime, timedelta
+from src.core.utils import time_utils
+
+
+class TestCoarseClock:
+    """Test the cached UTC clock."""
+
+    def test_utc_now_is_close_to_wall_clock(self):
+        """Test that the cached time is within the clock resolution."""
+        drift = abs(datetime.utcnow() - time_utils.utc_now())
+        assert drift <= timedelta(seconds=time_utils.CLOCK_RESOLUTION + 0.1)
+
+    def test_iso_string_matches_datetime(self):
+        """Test that the ISO string is derived from the cached datetime."""
+        assert time_utils.utc_now_iso() == time_utils.utc_now().isoformat()
+
+    def test_reading_is_reused_within_resolution(self):
+        """Test that repeated reads return the same cached object."""
+        assert time_utils.utc_now() is time_utils.utc_now()
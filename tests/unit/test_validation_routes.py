@@ -0,0 +1,337 @@
+"""
+Tests for the validation route helpers
+"""
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.database.models import Base, ValidationRecord
+from src.api.models.requests import ValidationRequest, BatchValidationRequest
+from src.api.models.responses import ValidationStatus, ErrorSeverity, ValidationHistoryResponse, ValidationSummary, ValidationStatusResponse
+from src.api.routes import validation
+from src.api.routes.validation import (
+    validate_shader,
+    validate_shaders_batch,
+    get_validation_history,
+    get_validation_status,
+    get_validation_summary,
+    _determine_status,
+    _determine_status_from_record,
+    _convert_errors,
+    _create_portability_issues
+)
+
+
+class TestStatusHelpers:
+    """Test that internally built statuses are enum members."""
+
+    def test_status_from_result(self):
+        """Test that validation results map onto ValidationStatus members."""
+        assert _determine_status({"is_valid": False}) is ValidationStatus.INVALID
+        assert _determine_status({"is_valid": True, "warnings": ["w"]}) is ValidationStatus.WARNING
+        assert _determine_status({"is_valid": True}) is ValidationStatus.VALID
+
+    def test_status_from_record(self):
+        """Test that stored records map onto ValidationStatus members."""
+        assert _determine_status_from_record(SimpleNamespace(status="error", is_valid=False)) is ValidationStatus.ERROR
+        assert _determine_status_from_record(SimpleNamespace(status=None, is_valid=None)) is ValidationStatus.PROCESSING
+        assert _determine_status_from_record(SimpleNamespace(status=None, is_valid=True, warning_count=0)) is ValidationStatus.VALID
+
+
+class TestConversionHelpers:
+    """Test conversion of service output into response models."""
+
+    def test_missing_severity_defaults_to_member(self):
+        """Test that default severities are ErrorSeverity members."""
+        assert _convert_errors([{"message": "m"}])[0].severity is ErrorSeverity.ERROR
+        assert _create_portability_issues([{"message": "m"}])[0].severity is ErrorSeverity.WARNING
+
+    def test_string_severity_is_coerced(self):
+        """Test that severities reported as strings by the service still validate."""
+        assert _convert_errors([{"severity": "info"}])[0].severity is ErrorSeverity.INFO
+
+    def test_missing_suggestions_become_empty_lists(self):
+        """Test that absent or null suggestions are returned as empty lists."""
+        assert _convert_errors([{"suggestions": None}])[0].suggestions == []
+        assert _create_portability_issues([{}])[0].suggestions == []
+
+
+@pytest.fixture
+def db():
+    """Create an in-memory database session with a few validation records."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    start = datetime(2024, 1, 1)
+    session.add_all([
+        ValidationRecord(id=f"val_{i}", format="glsl", is_valid=i % 2 == 0,
+                         status="valid" if i % 2 == 0 else "invalid", processing_time_ms=1.0,
+                         created_at=start + timedelta(minutes=i))
+        for i in range(5)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+async def _history(db, **filters):
+    """Call the history route with its query defaults and parse the response."""
+    params = dict(user_id=None, format=None, status=None, start_date=None, end_date=None,
+                  limit=2, offset=0, cursor=None, sort_by="created_at", sort_order="desc")
+    params.update(filters)
+    response = await get_validation_history(db=db, **params)
+    return ValidationHistoryResponse.model_validate_json(response.body)
+
+
+async def _summary(db):
+    """Call the summary route and parse the response."""
+    response = await get_validation_summary(db=db)
+    return ValidationSummary.model_validate_json(response.body)
+
+
+class TestValidateShader:
+    """Test storing single validation results."""
+
+    async def test_failure_after_storing_keeps_one_record(self, db, monkeypatch):
+        """Test that an error after the result is stored does not insert a second record."""
+        def fail(errors):
+            raise RuntimeError("conversion failed")
+        monkeypatch.setattr(validation, "_convert_errors", fail)
+        request = ValidationRequest(code="void main() { gl_FragColor = vec4(1.0); }", format="glsl")
+
+        response = await validate_shader(request=request, background_tasks=None, db=db)
+
+        body = orjson.loads(response.body)
+        assert body["status"] == "error"
+        record = db.query(ValidationRecord).filter(ValidationRecord.id == body["validation_id"]).one()
+        assert record.error_count == 0
+
+    async def test_error_record_has_error_status(self, db, monkeypatch):
+        """Test that a failed validation is stored with the error status."""
+        def fail(*args):
+            raise RuntimeError("validator crashed")
+        monkeypatch.setattr(validation.validation_service, "validate", fail)
+        request = ValidationRequest(code="void main() {}", format="glsl")
+
+        response = await validate_shader(request=request, background_tasks=None, db=db)
+
+        record = db.query(ValidationRecord).filter(
+            ValidationRecord.id == orjson.loads(response.body)["validation_id"]
+        ).one()
+        assert record.status == "error"
+
+
+class TestValidateShadersBatch:
+    """Test streaming batch validation results."""
+
+    @staticmethod
+    def _request():
+        """Build a sequential two-shader batch request."""
+        return BatchValidationRequest(
+            shaders=[ValidationRequest(code="void main() {}", format="glsl")] * 2,
+            parallel_processing=False
+        )
+
+    @staticmethod
+    def _results(monkeypatch, results):
+        """Make the validation service return the given batch results."""
+        monkeypatch.setattr(validation.validation_service, "validate_batch", lambda entries: results)
+
+    async def test_streams_complete_json(self, db, monkeypatch):
+        """Test that the streamed body parses as a whole BatchValidationResult."""
+        self._results(monkeypatch, [
+            {"is_valid": True, "warnings": [{"message": "w", "severity": "warning"}]},
+            {"is_valid": False, "errors": [{"message": "e", "severity": "error"}]}
+        ])
+
+        response = await validate_shaders_batch(request=self._request(), background_tasks=None, db=db)
+        body = orjson.loads(b"".join([chunk async for chunk in response.body_iterator]))
+
+        assert [result["status"] for result in body["results"]] == ["warning", "invalid"]
+        assert body["total_errors"] == 1 and body["total_warnings"] == 1
+
+    async def test_malformed_result_fails_before_streaming(self, db, monkeypatch):
+        """Test that a bad severity is a clean 500 instead of a truncated 200 body."""
+        self._results(monkeypatch, [
+            {"is_valid": True},
+            {"is_valid": False, "errors": [{"message": "e", "severity": "catastrophic"}]}
+        ])
+
+        with pytest.raises(HTTPException) as excinfo:
+            await validate_shaders_batch(request=self._request(), background_tasks=None, db=db)
+
+        assert excinfo.value.status_code == 500
+
+    def test_failed_batch_insert_rolls_back(self):
+        """Test that a failed executemany rolls the session back before re-raising."""
+        session = Mock()
+        session.execute.side_effect = RuntimeError("database is locked")
+
+        with pytest.raises(RuntimeError):
+            validation._save_records(session, [{"id": "val_new"}])
+
+        session.rollback.assert_called_once()
+        session.commit.assert_not_called()
+
+
+class TestValidationHistory:
+    """Test history pagination."""
+
+    async def test_page_carries_filtered_total(self, db):
+        """Test that the total comes back with the page, before limit and offset."""
+        response = await _history(db, status="valid")
+
+        assert [item.validation_id for item in response.items] == ["val_4", "val_2"]
+        assert response.total_count == 3
+        assert response.page_count == 2
+
+    async def test_status_filter_keeps_is_valid_meaning(self, db):
+        """Test that valid/invalid select the same rows as filtering on is_valid did."""
+        db.add_all([
+            ValidationRecord(id=f"val_{status or 'none'}_{is_valid}", format="glsl", is_valid=is_valid,
+                             status=status, processing_time_ms=1.0)
+            for status, is_valid in [("warning", True), ("error", False), ("processing", None),
+                                     (None, True), (None, False)]
+        ])
+        db.commit()
+
+        for status, is_valid in (("valid", True), ("invalid", False)):
+            expected = {record.id for record in db.query(ValidationRecord).filter(ValidationRecord.is_valid == is_valid)}
+            response = await _history(db, status=status, limit=100)
+            assert {item.validation_id for item in response.items} == expected
+            assert response.total_count == len(expected)
+
+    async def test_total_past_the_last_page(self, db):
+        """Test that paging past the end still reports the total."""
+        response = await _history(db, offset=10)
+
+        assert response.items == []
+        assert response.total_count == 5
+
+    async def test_unfiltered_total_uses_table_statistics(self, db):
+        """Test that an unfiltered page takes its total from ANALYZE statistics when present."""
+        assert (await _history(db)).approximate is False
+
+        db.execute(text("ANALYZE"))
+        db.add(ValidationRecord(id="val_new", format="glsl", is_valid=True, processing_time_ms=1.0))
+        db.commit()
+
+        response = await _history(db)
+        assert response.approximate is True
+        assert response.total_count == 5
+
+        filtered = await _history(db, format="glsl")
+        assert filtered.approximate is False
+        assert filtered.total_count == 6
+
+    async def test_cursor_walks_every_record_once(self, db):
+        """Test that following next_cursor visits each record in order without totals."""
+        for sort_order in ("desc", "asc"):
+            seen = []
+            response = await _history(db, sort_order=sort_order)
+            while True:
+                seen.extend(item.validation_id for item in response.items)
+                if response.next_cursor is None:
+                    break
+                response = await _history(db, sort_order=sort_order, cursor=response.next_cursor)
+                assert response.total_count is None
+
+            expected = [f"val_{i}" for i in range(5)]
+            assert seen == (expected[::-1] if sort_order == "desc" else expected)
+
+    async def test_malformed_cursor_is_rejected(self, db):
+        """Test that a cursor that does not decode returns 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            await _history(db, cursor="not-a-cursor")
+
+        assert exc_info.value.status_code == 400
+
+    async def test_unindexed_sort_is_rejected(self, db):
+        """Test that sorting by a column without an index is refused."""
+        with pytest.raises(HTTPException) as exc_info:
+            await _history(db, sort_by="quality_score")
+
+        assert exc_info.value.status_code == 400
+
+
+class TestValidationStatus:
+    """Test the status lookup."""
+
+    async def test_status_of_known_record(self, db):
+        """Test that a stored record is found through the bound-parameter query."""
+        response = await get_validation_status(validation_id="val_1", db=db)
+        status = ValidationStatusResponse.model_validate_json(response.body)
+
+        assert status.status == ValidationStatus.INVALID
+        assert status.progress == 1.0
+
+    async def test_unknown_record_is_404(self, db):
+        """Test that a missing id returns 404."""
+        with pytest.raises(HTTPException) as exc_info:
+            await get_validation_status(validation_id="missing", db=db)
+
+        assert exc_info.value.status_code == 404
+
+
+class TestValidationSummary:
+    """Test the aggregated summary statistics."""
+
+    @pytest.fixture(autouse=True)
+    def reset_summary_cache(self):
+        """Start every test without a cached summary."""
+        validation.reset_summary_cache()
+        yield
+        validation.reset_summary_cache()
+
+    async def test_summary_aggregates(self, db):
+        """Test that counts and averages come back from the single aggregate query."""
+        db.add(ValidationRecord(id="val_isf", format="isf", is_valid=False, error_count=2,
+                                warning_count=1, quality_score=0.5, processing_time_ms=9.0))
+        db.commit()
+
+        summary = await _summary(db)
+
+        assert (summary.total_validations, summary.valid_shaders, summary.invalid_shaders) == (6, 3, 3)
+        assert (summary.warning_shaders, summary.total_errors, summary.total_warnings) == (1, 2, 1)
+        assert summary.average_quality_score == 0.5
+        assert (summary.fastest_validation_ms, summary.slowest_validation_ms) == (1.0, 9.0)
+        assert summary.format_distribution == {"glsl": 5, "isf": 1}
+
+    async def test_empty_summary(self, db):
+        """Test that an empty table yields zeros rather than nulls."""
+        db.query(ValidationRecord).delete()
+        db.commit()
+
+        summary = await _summary(db)
+
+        assert summary.total_validations == 0
+        assert summary.valid_shaders == 0
+        assert summary.average_processing_time_ms == 0.0
+
+    async def test_summary_is_cached_until_ttl(self, db, monkeypatch):
+        """Test that a computed summary is reused until it expires."""
+        assert (await _summary(db)).total_validations == 5
+        db.add(ValidationRecord(id="val_new", format="glsl", is_valid=True, processing_time_ms=1.0))
+        db.commit()
+
+        assert (await _summary(db)).total_validations == 5
+
+        # Jump the route's clock past the TTL without touching the event loop's
+        monkeypatch.setattr(validation, "time", SimpleNamespace(monotonic=lambda: float("inf")))
+        assert (await _summary(db)).total_validations == 6
+
+    async def test_saving_a_record_invalidates_summary(self, db):
+        """Test that stored validations show up in the next summary without waiting for the TTL."""
+        assert (await _summary(db)).total_validations == 5
+
+        validation._save_record(db, ValidationRecord(id="val_new", format="glsl", is_valid=True))
+        assert (await _summary(db)).total_validations == 6
+
+        validation._save_records(db, [{"id": "val_batch", "format": "glsl", "is_valid": True}])
+        assert (await _summary(db)).total_validations == 7
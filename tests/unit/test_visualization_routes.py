@@ -0,0 +1,148 @@
+"""
+Tests for the visualization route helpers
+"""
+
+import io
+import pytest
+import numpy as np
+from base64 import b64encode
+from PIL import Image
+from unittest.mock import Mock
+from src.api.routes import visualization
+
+
+def _png(width, height, mode="RGBA"):
+    """Encode a blank image as PNG bytes."""
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Replace the visualization service with a mock that 'renders' img_1."""
+    mock_service = Mock()
+    mock_service.render_glsl_shader.return_value = ("img_1", b"")
+    mock_service.get_image_metadata.return_value = {"created_at": "2024-01-01T00:00:00"}
+    monkeypatch.setattr(visualization, "get_visualization_service", lambda: mock_service)
+    return mock_service
+
+
+class TestMultipartVisualization:
+    """Test rendering with textures uploaded as files."""
+
+    def test_textures_are_passed_to_the_render(self, client, service):
+        """Test that uploads are decoded to RGBA without base64 and rendered under their file names."""
+        response = client.post(
+            "/api/v1/multipart",
+            data={"shader_type": "GLSL", "shader_source": "void main() {}", "width": "128",
+                  "parameters": '{"time": 1.0}'},
+            files=[("textures", ("noise.png", _png(4, 2, "L"), "image/png"))]
+        )
+
+        assert response.status_code == 200
+        assert response.json()["image_id"] == "img_1"
+        assert response.json()["width"] == 128
+        args = service.render_glsl_shader.call_args.args
+        assert args[3] == {"time": 1.0}
+        assert list(args[5]) == ["noise"]
+        assert args[5]["noise"].shape == (2, 4, 4)
+
+    def test_undecodable_texture_is_rejected(self, client, service):
+        """Test that a texture that is not an image fails the request instead of being dropped."""
+        response = client.post(
+            "/api/v1/multipart",
+            data={"shader_type": "GLSL", "shader_source": "void main() {}"},
+            files=[("textures", ("noise.png", _png(4, 2), "image/png")),
+                   ("textures", ("broken.png", b"not an image", "image/png"))]
+        )
+
+        assert response.status_code == 400
+        assert "broken" in response.json()["detail"]
+        service.render_glsl_shader.assert_not_called()
+
+    def test_invalid_parameters_are_rejected(self, client, service):
+        """Test that a parameters field that is not a JSON object is a client error."""
+        response = client.post(
+            "/api/v1/multipart",
+            data={"shader_type": "GLSL", "shader_source": "void main() {}", "parameters": "[1, 2]"}
+        )
+
+        assert response.status_code == 400
+        service.render_glsl_shader.assert_not_called()
+
+    def test_texture_arrays_are_rgba_views(self):
+        """Test that RGBA images are wrapped as they are and other modes are converted."""
+        rgba = Image.new("RGBA", (3, 2), (1, 2, 3, 4))
+
+        assert visualization._texture_array(rgba).shape == (2, 3, 4)
+        assert not visualization._texture_array(rgba).flags.writeable
+        assert visualization._texture_array(Image.new("L", (3, 2), 7))[0, 0].tolist() == [7, 7, 7, 255]
+
+    def test_base64_and_upload_decode_alike(self):
+        """Test that both texture decoders produce the same array."""
+        png = _png(3, 3, "RGB")
+
+        from_json = visualization._decode_texture("data:image/png;base64," + b64encode(png).decode())
+        from_upload = visualization._open_texture(io.BytesIO(png))
+
+        assert from_json.shape == (3, 3, 4)
+        assert np.array_equal(from_json, from_upload)
+
+
+class TestBatchVisualization:
+    """Test batch rendering."""
+
+    def test_batch_textures_are_passed_to_the_render(self, client, service):
+        """Test that each batch entry renders with its own textures and bad ones fail alone."""
+        texture = "data:image/png;base64," + b64encode(_png(2, 2)).decode()
+        shader = {"shader_type": "GLSL", "shader_source": "void main() {}"}
+
+        response = client.post("/api/v1/batch", json={"shaders": [
+            {**shader, "input_textures": {"noise": texture}},
+            {**shader, "input_textures": {"noise": "not base64!"}}
+        ]})
+
+        assert response.status_code == 200
+        assert response.json()["completed"] == 1
+        assert response.json()["failed"] == 1
+        textures = service.render_glsl_shader.call_args.args[5]
+        assert textures["noise"].shape == (2, 2, 4)
+
+
+class TestImageRoutes:
+    """Test image retrieval and thumbnails."""
+
+    def test_format_case_does_not_force_a_conversion(self, client, service):
+        """Test that a stored format in another case is served as-is."""
+        service.get_image.return_value = b"png bytes"
+        service.get_image_metadata.return_value = {"format": "png"}
+
+        response = client.get("/api/v1/images/img_1", params={"format": "PNG"})
+
+        assert response.status_code == 200
+        assert response.content == b"png bytes"
+        service.convert_image_format.assert_not_called()
+
+    def test_image_is_converted_to_the_requested_format(self, client, service):
+        """Test that a different format is converted before it is served."""
+        service.get_image.return_value = b"png bytes"
+        service.get_image_metadata.return_value = {"format": "PNG"}
+        service.convert_image_format.return_value = b"webp bytes"
+
+        response = client.get("/api/v1/images/img_1", params={"format": "WEBP"})
+
+        assert response.content == b"webp bytes"
+        assert response.headers["content-type"] == "image/webp"
+        service.convert_image_format.assert_called_once_with("img_1", "WEBP")
+
+    def test_thumbnail_negotiates_webp(self, client, service):
+        """Test that a thumbnail is encoded as WebP for clients that accept it."""
+        service.create_thumbnail.return_value = b"thumbnail"
+
+        response = client.post("/api/v1/images/img_1/thumbnail", json={"image_id": "img_1", "width": 32, "height": 32},
+                               headers={"Accept": "image/webp"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        service.create_thumbnail.assert_called_once_with("img_1", (32, 32), "WEBP")